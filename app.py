@@ -1,264 +1,317 @@
 # app.py (fixed)
 import os
-import re
-import time
+import json
+import queue
 import random
-import datetime
-import base64
+import time
+import urllib.error
+import urllib.request
 
 import streamlit as st
 import pandas as pd
-import pymysql
-import fitz  # PyMuPDF
-import phonenumbers
-import spacy
 from PIL import Image
 from streamlit_tags import st_tags
 
-# Optional YouTube helper
-os.environ["PAFY_BACKEND"] = "internal"
-try:
-    import pafy  # noqa: E402
-except Exception:
-    pafy = None
-
-# Courses import (keep as-is — ensure Courses.py exists)
-from Courses import (
-    ds_course,
-    web_course,
-    android_course,
-    ios_course,
-    uiux_course,
-    resume_videos,
-    interview_videos,
-)
-
-# Load spaCy once
-nlp = spacy.load("en_core_web_sm")
-
-# Heuristics / keywords
-BAD_KEYWORDS = [
-    "resume", "curriculum", "cv", "linkedin", ".com", "email", "phone", "mobile", "tel",
-    "github", "address", "objective", "profile", "summary", "skills", "experience"
-]
-
-SKILLS = [
-    "Python", "Java", "C++", "JavaScript", "HTML", "CSS",
-    "Machine Learning", "Deep Learning", "SQL", "Django",
-    "React", "Node.js", "Flask", "AWS", "Data Analysis",
-    "Streamlit", "Pandas", "TensorFlow", "Keras", "PyTorch",
-    "Android", "Kotlin", "Flutter", "Swift", "iOS", "Figma", "Adobe XD"
-]
-
-ds_keyword     = [s.lower() for s in ['tensorflow','keras','pytorch','machine learning','deep learning','flask','streamlit','pandas','scikit-learn','numpy','matplotlib','data science']]
-web_keyword    = [s.lower() for s in ['react','django','node js','react js','php','laravel','magento','wordpress','javascript','angular js','c#','flask','html','css']]
-android_keyword= [s.lower() for s in ['android','android development','flutter','kotlin','xml','kivy','java']]
-ios_keyword    = [s.lower() for s in ['ios','ios development','swift','cocoa','cocoa touch','xcode','objective-c']]
-uiux_keyword   = [s.lower() for s in ['ux','adobe xd','figma','zeplin','balsamiq','ui','prototyping','wireframes','storyframes','adobe photoshop','photoshop','illustrator','after effects','premier pro','indesign','user research','user experience']]
-
-# -------------------------
-# Name extraction utilities
-# -------------------------
-def extract_text_from_pdf_raw(pdf_path: str) -> str:
-    """Extract full raw text from PDF using PyMuPDF (fitz)."""
-    doc = fitz.open(pdf_path)
-    full_text = ""
-    for page in doc:
-        full_text += page.get_text("text") + "\n"
-    return full_text.strip()
-
-def extract_text_from_pdf(pdf_path: str) -> tuple[str, int]:
-    """Return (text, number_of_pages)."""
-    text = ""
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            text += page.get_text("text") + "\n"
-        pages = len(doc)
-    return text.strip(), pages
-
-def extract_first_lines(pdf_path: str, n_lines: int = 8) -> str:
-    """Return the first n_lines of the first page as a block of text."""
-    doc = fitz.open(pdf_path)
-    if doc.page_count == 0:
-        return ""
-    text = doc[0].get_text("text")
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    return "\n".join(lines[:n_lines])
-
-def looks_like_name(s: str) -> bool:
-    words = [w for w in s.split() if w.strip()]
-    if len(words) < 2 or len(words) > 4:
-        return False
-    if any(ch.isdigit() for ch in s) or "@" in s or any(tok in s.lower() for tok in BAD_KEYWORDS):
-        return False
-    count_title = sum(1 for w in words if w and (w[0].isupper() or w.isupper()))
-    return count_title >= max(1, len(words)-1)
-
-def extract_name_by_font(pdf_path: str) -> str | None:
-    """Choose the largest text spans on the first page and return best candidate."""
-    doc = fitz.open(pdf_path)
-    if doc.page_count == 0:
-        return None
-    page = doc[0]
-    data = page.get_text("dict")
-    spans = []
-    for block in data.get("blocks", []):
-        if block.get("type") != 0:
-            continue
-        for line in block.get("lines", []):
-            for span in line.get("spans", []):
-                txt = span.get("text", "").strip()
-                if not txt:
-                    continue
-                size = span.get("size", 0)
-                bbox = span.get("bbox", [0,0,0,0])
-                low = txt.lower()
-                if any(tok in low for tok in BAD_KEYWORDS) or "@" in txt or len(txt) < 2:
-                    continue
-                spans.append({"text": txt, "size": size, "y": bbox[1]})
-    if not spans:
-        return None
-    spans.sort(key=lambda s: (-s["size"], s["y"]))
-    for cand in spans[:6]:
-        if looks_like_name(cand["text"]):
-            return cand["text"]
-    return spans[0]["text"]
-
-def extract_name_by_ner(text: str) -> str | None:
-    """Use regex for explicit 'Name:' patterns and spaCy NER on the provided text chunk."""
-    m = re.search(r'(?:Name|Full Name|Candidate)\s*[:\-]\s*([A-Z][A-Za-z\.\s]{1,120})', text, re.I)
-    if m:
-        candidate = m.group(1).strip()
-        if looks_like_name(candidate):
-            return candidate
-    doc = nlp(text)
-    persons = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
-    if not persons:
-        return None
-    for p in persons:
-        if looks_like_name(p):
-            return p
-    return persons[0]
-
-def extract_applicant_name(pdf_path: str) -> str:
-    # 1) font/layout heuristics
-    try:
-        name = extract_name_by_font(pdf_path)
-        if name:
-            return name
-    except Exception:
-        pass
-    # 2) NER on header
+# Videos import (keep as-is — ensure Courses.py exists)
+from Courses import resume_videos, interview_videos
+
+import db
+import export
+import video_titles
+from search import CandidateIndex
+from resume_cache import ResumeCache, content_key
+from resume_parser import (LshIndex, PdfDocument, analyze_resume, get_taxonomy, metrics, minhash, parse_document,
+                           recommend_courses)
+
+# DB connections - update credentials in config.py as needed
+@st.cache_resource
+def get_pool() -> db.ConnectionPool:
+    """Connection pool shared by every session; creates the table on first use."""
+    pool = db.ConnectionPool(size=int(os.environ.get("RESUME_DB_POOL_SIZE", "5")))
+    with pool.connection() as conn:
+        db.create_table(conn)
+    return pool
+
+@st.cache_resource
+def get_insert_queue() -> db.InsertQueue:
+    return db.InsertQueue(get_pool(),
+                          batch_size=int(os.environ.get("RESUME_DB_BATCH", "50")),
+                          flush_interval=float(os.environ.get("RESUME_DB_FLUSH_SECS", "2")))
+
+def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses,
+                resume_key=None, dup_group=None, minhash_hex=None):
+    """Queue the row; the write-behind queue inserts it with the next batch."""
     try:
-        header = extract_first_lines(pdf_path, n_lines=10)
-        name = extract_name_by_ner(header or "")
-        if name:
-            return name
-    except Exception:
-        pass
-    # 3) NER on full text
-    try:
-        full_text = extract_text_from_pdf_raw(pdf_path)
-        name = extract_name_by_ner(full_text or "")
-        if name:
-            return name
-    except Exception:
-        pass
-    return "Name not found"
+        get_insert_queue().put(db.make_row(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level,
+                                           skills, recommended_skills, courses, resume_key, dup_group, minhash_hex))
+    except queue.Full:
+        st.warning("Your results could not be saved right now because the database is not keeping up. "
+                   "Please try again later.")
+
+@st.cache_resource
+def get_search_index() -> CandidateIndex | None:
+    """Local candidate search index; set RESUME_SEARCH_DB to an empty string to turn it off."""
+    path = os.environ.get("RESUME_SEARCH_DB", "candidate_index.db")
+    return CandidateIndex(path) if path else None
+
+# Uploads whose text is at least this similar to an earlier one reuse its parse.
+DEDUP_THRESHOLD = float(os.environ.get("RESUME_DEDUP_THRESHOLD", str(minhash.DEFAULT_THRESHOLD)))
+
+@st.cache_resource
+def get_dup_index() -> LshIndex:
+    """Near-duplicate index of every stored resume, kept up to date as uploads come in."""
+    with get_pool().connection() as conn:
+        return db.load_duplicate_index(conn, DEDUP_THRESHOLD)
 
 # -------------------------
-# Other extractors
+# UI helpers
 # -------------------------
-def extract_email(text: str) -> str | None:
-    match = re.search(r"[\w\.-]+@[\w\.-]+\.\w+", text)
-    return match.group(0) if match else None
+LEVEL_MESSAGES = {
+    "Fresher": "<h4 style='color:#d73b5c;'>You are at Fresher level!</h4>",
+    "Intermediate": "<h4 style='color:#1ed760;'>You are at Intermediate level!</h4>",
+    "Experienced": "<h4 style='color:#fba171;'>You are at Experienced level!</h4>",
+}
+
+# section label -> (message when present, message when missing)
+SCORE_MESSAGES = {
+    'Objective': (
+        '''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Objective</h5>''',
+        '''<h5 style='text-align: left; color: #white;'>[-] Please add your career objective, it will give your career intension to the Recruiters.</h5>''',
+    ),
+    'Experience': (
+        '''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h5>''',
+        '''<h5 style='text-align: left; color: #white;'>[-] Please add Experience. It will give the assurance that everything written on your resume is true and fully acknowledged by you</h5>''',
+    ),
+    'Hobbies/Interests': (
+        '''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies/Interests</h5>''',
+        '''<h5 style='text-align: left; color: #white;'>[-] Please add Hobbies/Interests. It will show your personality to the Recruiters.</h5>''',
+    ),
+    'Achievements': (
+        '''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements</h5>''',
+        '''<h5 style='text-align: left; color: #white;'>[-] Please add Achievements. It will show that you are capable for the required position.</h5>''',
+    ),
+    'Projects': (
+        '''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h5>''',
+        '''<h5 style='text-align: left; color: #white;'>[-] Please add Projects. It will show that you have done work related to the required position.</h5>''',
+    ),
+}
+
+@st.cache_resource
+def get_result_cache() -> ResumeCache:
+    """Parse-result cache shared by every session and kept across reruns."""
+    return ResumeCache(
+        max_entries=int(os.environ.get("RESUME_CACHE_SIZE", "256")),
+        db_path=os.environ.get("RESUME_CACHE_DB") or None,
+    )
 
-def extract_phone(text: str) -> str | None:
+# When set, parsing is done by the HTTP service (server.py) instead of in this process.
+RESUME_API_URL = os.environ.get("RESUME_API_URL")
+
+# What to tell the user when the service answers with an error status.
+REMOTE_ERRORS = {
+    413: "This PDF is too large to analyse.",
+    422: "This file could not be read as a PDF resume.",
+    503: "The resume parser is busy right now. Please try again in a moment.",
+    504: "Analysing this resume took too long. Please try again, or upload a simpler PDF.",
+}
+
+class ParseFailed(Exception):
+    """The parsing service could not parse the upload; the message is meant for the user."""
+
+def remote_parse(data: bytes) -> dict:
+    """Parse with the HTTP service, retrying once when it is busy; raises ParseFailed otherwise."""
+    req = urllib.request.Request(RESUME_API_URL.rstrip("/") + "/parse?include_text=1", data=data,
+                                 headers={"Content-Type": "application/pdf"}, method="POST")
+    for attempt in range(2):
+        try:
+            with urllib.request.urlopen(req, timeout=120) as resp:
+                return json.load(resp)["resume"]
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After", "1")
+            e.close()
+            if e.code == 503 and attempt == 0:
+                time.sleep(min(int(retry_after), 10) if retry_after.isdigit() else 1)
+                continue
+            raise ParseFailed(REMOTE_ERRORS.get(e.code, f"The resume parser failed (HTTP {e.code}).")) from e
+        except (urllib.error.URLError, TimeoutError) as e:
+            raise ParseFailed("Could not reach the resume parser. Please try again later.") from e
+
+def prior_duplicate(signature) -> dict | None:
+    """Match info and name of an earlier near-identical upload, if its parse is still cached."""
+    found = get_dup_index().match(signature)
+    if found is None:
+        return None
+    prior = get_result_cache().get(found[0], record=False)  # a side lookup, not a cache request
+    if prior is None:
+        return None
+    return {"duplicate_of": found[0], "similarity": round(found[1], 3), "name": prior.get("name")}
+
+def parse_upload(data: bytes) -> dict:
+    if RESUME_API_URL:
+        return remote_parse(data)
+    with PdfDocument(data) as doc:
+        signature = minhash.signature(doc.text)
+        prior = prior_duplicate(signature)
+        if prior is None:
+            return parse_document(doc, signature=signature)
+        # An edited resume may add skills or sections, so only the (costly, stable) NER name is reused.
+        return {**parse_document(doc, name=prior.pop("name"), signature=signature), **prior}
+
+def fetch_yt_video(link: str, default: str = video_titles.DEFAULT_TITLE) -> str:
+    """Title from the persisted cache (`default` until it is known); never blocks on the network."""
+    return video_titles.get_title(link, default)
+
+# Originals are kept as <sha256>.pdf so re-uploads and same-named files never clash.
+# Set RESUME_UPLOAD_DIR to an empty string to not keep them at all.
+UPLOAD_DIR = os.environ.get("RESUME_UPLOAD_DIR", "./Uploaded Resume")
+
+def persist_upload(key: str, data: bytes) -> None:
+    if not UPLOAD_DIR:
+        return
+    path = os.path.join(UPLOAD_DIR, key + ".pdf")
+    if os.path.exists(path):
+        return
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def preview_images(key: str, _data: bytes) -> list[bytes]:
+    """First-page thumbnails, cached by content hash (_data is not hashed by Streamlit)."""
+    with PdfDocument(_data) as doc:
+        return doc.thumbnails(max_pages=2)
+
+def show_pdf(key: str, data: bytes) -> None:
     try:
-        for match in phonenumbers.PhoneNumberMatcher(text, "IN"):
-            return phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+        st.image(preview_images(key, data), width=340)
     except Exception:
         pass
-    return None
 
-def extract_skills(text: str):
-    tl = (text or "").lower()
-    found = []
-    for skill in SKILLS:
-        if skill.lower() in tl:
-            found.append(skill)
-    return sorted(set(found))
+def course_recommender(reco_field: str):
+    st.subheader("**Courses & Certificates Recommendations 🎓**")
+    rec_course = []
+    no_of_recommendations = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
+    for c, (c_name, c_link) in enumerate(recommend_courses(reco_field, no_of_recommendations), start=1):
+        st.markdown(f"({c}) [{c_name}]({c_link})")
+        rec_course.append(c_name)
+    return rec_course
 
 # -------------------------
-# Resume parsing / DB
+# Admin dashboard
 # -------------------------
-def parse_resume(pdf_path: str) -> dict:
-    text, pages = extract_text_from_pdf(pdf_path)
-    name = extract_applicant_name(pdf_path)
-    data = {
-        "name": name,
-        "email": extract_email(text),
-        "mobile_number": extract_phone(text),
-        "skills": extract_skills(text),
-        "no_of_pages": pages,
-        "text": text,
+ADMIN_PAGE_SIZE = 50
+
+def admin_filters() -> dict:
+    """Filter widgets for the admin view; returns keyword args for db.filter_clause."""
+    st.sidebar.markdown("## Filters")
+    dates = st.sidebar.date_input("Date range", value=())
+    fields = ["All"] + get_taxonomy().fields
+    field = st.sidebar.selectbox("Predicted field", fields)
+    level = st.sidebar.selectbox("User level", ["All", "Fresher", "Intermediate", "Experienced"])
+    min_score, max_score = st.sidebar.slider("Resume score", 0, 100, (0, 100))
+    return {
+        "date_from": dates[0] if len(dates) > 0 else None,
+        "date_to": dates[1] if len(dates) > 1 else None,
+        "field": None if field == "All" else field,
+        "level": None if level == "All" else level,
+        "min_score": min_score if min_score > 0 else None,
+        "max_score": max_score if max_score < 100 else None,
+        "collapse_duplicates": st.sidebar.checkbox("Collapse near-duplicate resumes", value=False),
     }
-    return data
-
-# DB connection - update credentials as needed
-# Note: this assumes database 'cv' already exists and your user can connect to it.
-# If not, create DB manually or modify this code to create DB before connecting.
-from config import DB_HOST, DB_USER, DB_PASS, DB_NAME
-connection = pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASS, db=DB_NAME)
-cursor = connection.cursor()
-
-def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses):
-    DB_table_name = 'user_data'
-    insert_sql = (
-        f"INSERT INTO {DB_table_name} "
-        "(Name, email , res_score, timestamp, no_of_pages, reco_Field, cand_level, skills, recommended_skills, courses) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
-    )
-    rec_values = (name, email, str(res_score), timestamp, str(no_of_pages), reco_field, cand_level, skills, recommended_skills, courses)
-    cursor.execute(insert_sql, rec_values)
-    connection.commit()
 
-# -------------------------
-# UI helpers
-# -------------------------
-def fetch_yt_video(link: str) -> str:
-    if not pafy:
-        return "Video"
-    try:
-        video = pafy.new(link)
-        return video.title
-    except Exception:
-        return "Video"
-
-def get_table_download_link(df: pd.DataFrame, filename: str, text: str) -> str:
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    return f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
+EXPORT_MIME = {"csv": "text/csv", "csv.gz": "application/gzip", "parquet": "application/octet-stream"}
 
-def show_pdf(file_path: str) -> None:
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode("utf-8")
-    pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
+def _discard_export():
+    prepared = st.session_state.pop('admin_export', None)
+    if prepared and os.path.exists(prepared[0]):
+        os.remove(prepared[0])
 
-def course_recommender(course_list):
-    st.subheader("**Courses & Certificates Recommendations 🎓**")
-    c = 0
-    rec_course = []
-    no_of_recommendations = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
-        st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_recommendations:
-            break
-    return rec_course
+def export_report(filters: dict):
+    """Stream the filtered rows to a temp file and offer it for download."""
+    st.subheader("**Download Report**")
+    fmt = st.selectbox("Format", export.available_formats(), key='export_format')
+    if st.button("Prepare report"):
+        _discard_export()
+        try:
+            with st.spinner("Exporting..."):
+                with get_pool().connection() as conn:
+                    path, count = export.export_user_data(conn, filters, fmt)
+        except Exception as e:
+            st.error(f"Export failed: {e}")
+            return
+        st.session_state['admin_export'] = (path, count, fmt)
+    prepared = st.session_state.get('admin_export')
+    if prepared and os.path.exists(prepared[0]):
+        path, count, fmt = prepared
+        with open(path, "rb") as f:
+            # The served bytes are held by Streamlit, so the file can go once it is downloaded.
+            st.download_button(f"Download Report ({count} rows)", f, on_click=_discard_export,
+                               file_name='User_Data' + export.FORMATS[fmt], mime=EXPORT_MIME[fmt])
+
+SEARCH_COLUMNS = [("name", "Name"), ("email", "Email"), ("score", "Resume Score"), ("level", "User Level"),
+                  ("field", "Predicted Field"), ("skills", "Skills"), ("timestamp", "Timestamp")]
+
+def candidate_search():
+    index = get_search_index()
+    if index is None:
+        return
+    st.subheader("**Search Candidates**")
+    query = st.text_input("Query", placeholder="python AND aws, intermediate, score >= 60")
+    if not query:
+        return
+    try:
+        results = index.search(query, limit=ADMIN_PAGE_SIZE)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.text(f"{len(results)} best matches")
+    df = pd.DataFrame([[r[k] for k, _ in SEARCH_COLUMNS] for r in results], columns=[n for _, n in SEARCH_COLUMNS])
+    df["Skills"] = df["Skills"].map(", ".join)
+    st.dataframe(df)
+
+def admin_dashboard():
+    filters = admin_filters()
+    # Keyset pagination: a stack of "before ID" cursors, reset whenever the filters change.
+    if st.session_state.get('admin_filters') != filters:
+        st.session_state['admin_filters'] = filters
+        st.session_state['admin_cursors'] = [None]
+    cursors = st.session_state['admin_cursors']
+
+    with get_pool().connection() as conn:
+        stats = db.summary_stats(conn, filters)
+        rows = db.fetch_page(conn, filters, before_id=cursors[-1], limit=ADMIN_PAGE_SIZE)
+
+    st.header("**User's Data**")
+    st.text(f"Matching resumes: {stats['total']}"
+            + (f"   Average score: {stats['avg_score']:.1f}" if stats['avg_score'] is not None else ""))
+    df = pd.DataFrame(rows, columns=[name for _, name in db.ADMIN_COLUMNS])
+    st.dataframe(df)
+
+    col_prev, col_page, col_next = st.columns(3)
+    if col_prev.button("Previous page", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    col_page.text(f"Page {len(cursors)}")
+    if col_next.button("Next page", disabled=len(rows) < ADMIN_PAGE_SIZE):
+        cursors.append(rows[-1][0])
+        st.rerun()
+
+    candidate_search()
+    export_report(filters)
+
+    # Everything below comes from the rollup tables (see db.summary_stats).
+    if filters["collapse_duplicates"]:
+        st.caption("The charts count every upload, including near-duplicates.")
+    st.subheader("**Resumes per Day**")
+    st.line_chart(pd.DataFrame(stats["by_day"], columns=["Day", "Count"]).set_index("Day"))
+    st.subheader("**Resumes by Predicted Field**")
+    st.bar_chart(pd.DataFrame(stats["by_field"], columns=["Predicted Field", "Count"]).set_index("Predicted Field"))
+    st.subheader("**Resumes by User Level**")
+    st.bar_chart(pd.DataFrame(stats["by_level"], columns=["User Level", "Count"]).set_index("User Level"))
+    st.subheader("**Resume Score Distribution**")
+    st.bar_chart(pd.DataFrame(stats["score_histogram"], columns=["Score", "Count"]).set_index("Score"))
+    st.subheader("**Top Skills**")
+    st.bar_chart(pd.DataFrame(stats["top_skills"], columns=["Skill", "Count"]).set_index("Skill"))
 
 # -------------------------
 # Streamlit app
@@ -269,6 +322,7 @@ st.set_page_config(
 )
 
 def run():
+    metrics.start_file_exporter()
     # header/logo
     if os.path.exists('./Logo/logo2.png'):
         try:
@@ -285,149 +339,66 @@ def run():
     st.sidebar.markdown(link, unsafe_allow_html=True)
 
     # Create table if not exists
-    DB_table_name = 'user_data'
-    # NOTE: avoid DEFAULT on TEXT/BLOB columns. Use VARCHAR for short fields.
-    table_sql = (
-    "CREATE TABLE IF NOT EXISTS " + DB_table_name + """ (
-        ID INT NOT NULL AUTO_INCREMENT,
-        Name VARCHAR(500) NOT NULL,
-        email VARCHAR(500) DEFAULT '',
-        resume_score VARCHAR(8) DEFAULT '0',
-        Timestamp VARCHAR(50) DEFAULT '',
-        Page_no VARCHAR(5) DEFAULT '0',
-        Predicted_Field VARCHAR(255) DEFAULT '',
-        User_level VARCHAR(100) DEFAULT '',
-        Actual_skills TEXT,
-        Recommended_skills TEXT,
-        Recommended_courses TEXT,
-        PRIMARY KEY (ID)
-    );
-    """
-)
-
-    cursor.execute(table_sql)
+    get_pool()
 
     if choice == 'User':
         st.markdown("<h5>Upload your resume, and get smart recommendations</h5>", unsafe_allow_html=True)
         pdf_file = st.file_uploader("Choose your Resume", type=["pdf"])
         if pdf_file is not None:
-            with st.spinner('Uploading your Resume...'):
-                time.sleep(1.2)
+            pdf_bytes = pdf_file.getvalue()
+            key = content_key(pdf_bytes)
+            persist_upload(key, pdf_bytes)
 
-            upload_dir = "./Uploaded Resume"
-            os.makedirs(upload_dir, exist_ok=True)
-            save_path = os.path.join(upload_dir, pdf_file.name)
-            with open(save_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
+            show_pdf(key, pdf_bytes)
 
-            show_pdf(save_path)
-
-            resume_data = parse_resume(save_path)
-            resume_text = resume_data.get("text", "") or ""
-            resume_text_lower = resume_text.lower()
+            try:
+                with metrics.request_trace(key[:16], bytes=len(pdf_bytes)):
+                    resume_data = get_result_cache().get_or_parse(pdf_bytes, lambda: parse_upload(pdf_bytes), key=key)
+            except ParseFailed as e:
+                st.error(str(e))
+                st.stop()
 
             if resume_data:
+                dup_group = get_dup_index().add(key, minhash.from_hex(resume_data.get("minhash")))
+                if dup_group != key:
+                    similarity = resume_data.get("similarity")
+                    st.info("This resume closely matches one submitted before"
+                            + (f" ({similarity:.0%} similar)" if similarity else "") + ".")
+                analysis = analyze_resume(resume_data)
                 st.header("**Resume Analysis**")
                 st.success(f"Hello {resume_data.get('name') or 'there'}")
-                st.text(f"Email: {resume_data.get('email') or '-'}")
-                st.text(f"Contact: {resume_data.get('mobile_number') or '-'}")
+                st.text(f"Email: {', '.join(resume_data.get('emails') or [resume_data.get('email') or '-'])}")
+                st.text(f"Contact: {', '.join(resume_data.get('phones') or [resume_data.get('mobile_number') or '-'])}")
+                if resume_data.get('profiles'):
+                    st.text(f"Profiles: {', '.join(resume_data['profiles'])}")
                 st.text(f"Resume pages: {resume_data.get('no_of_pages') or '-'}")
 
-                cand_level = ""
-                pages = resume_data.get('no_of_pages') or 0
-                try:
-                    pages = int(pages)
-                except Exception:
-                    pages = 0
-
-                if pages == 1:
-                    cand_level = "Fresher"
-                    st.markdown("<h4 style='color:#d73b5c;'>You are at Fresher level!</h4>", unsafe_allow_html=True)
-                elif pages == 2:
-                    cand_level = "Intermediate"
-                    st.markdown("<h4 style='color:#1ed760;'>You are at Intermediate level!</h4>", unsafe_allow_html=True)
-                elif pages >= 3:
-                    cand_level = "Experienced"
-                    st.markdown("<h4 style='color:#fba171;'>You are at Experienced level!</h4>", unsafe_allow_html=True)
+                cand_level = analysis["cand_level"]
+                if cand_level:
+                    st.markdown(LEVEL_MESSAGES[cand_level], unsafe_allow_html=True)
 
                 st_tags(label='### Your Current Skills',
                         text='See our skills recommendation below',
                         value=resume_data.get('skills') or [],
                         key='skills_current')
 
-                reco_field = ''
-                recommended_skills = []
+                reco_field = analysis["reco_field"]
+                recommended_skills = analysis["recommended_skills"]
                 rec_course = []
-
-                def any_kw(kws):
-                    return any(k in resume_text_lower for k in kws)
-
-                if any_kw(ds_keyword):
-                    reco_field = 'Data Science'
-                    recommended_skills = ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
-                                          'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis',
-                                          'Web Scraping', 'ML Algorithms', 'Keras', 'PyTorch', 'Probability',
-                                          'Scikit-learn', 'TensorFlow', 'Flask', 'Streamlit']
-                    rec_course = course_recommender(ds_course)
-                elif any_kw(web_keyword):
-                    reco_field = 'Web Development'
-                    recommended_skills = ['React', 'Django', 'Node JS', 'React JS', 'PHP', 'Laravel', 'Magento',
-                                          'WordPress', 'JavaScript', 'Angular', 'C#', 'Flask', 'SDK']
-                    rec_course = course_recommender(web_course)
-                elif any_kw(android_keyword):
-                    reco_field = 'Android Development'
-                    recommended_skills = ['Android', 'Flutter', 'Kotlin', 'XML', 'Java', 'Kivy', 'GIT', 'SDK', 'SQLite']
-                    rec_course = course_recommender(android_course)
-                elif any_kw(ios_keyword):
-                    reco_field = 'iOS Development'
-                    recommended_skills = ['iOS', 'Swift', 'Cocoa', 'Cocoa Touch', 'Xcode', 'Objective-C',
-                                          'SQLite', 'Plist', 'StoreKit', 'UI-Kit', 'AV Foundation', 'Auto-Layout']
-                    rec_course = course_recommender(ios_course)
-                elif any_kw(uiux_keyword):
-                    reco_field = 'UI-UX Development'
-                    recommended_skills = ['UI', 'User Experience', 'Adobe XD', 'Figma', 'Zeplin', 'Balsamiq',
-                                          'Prototyping', 'Wireframes', 'Storyframes', 'Adobe Photoshop', 'Editing',
-                                          'Illustrator', 'After Effects', 'Premier Pro', 'InDesign', 'User Research']
-                    rec_course = course_recommender(uiux_course)
+                if reco_field:
+                    ranking = ", ".join(f"{field} {conf:.0%}" for field, conf in analysis["field_ranking"][:3])
+                    st.success(f"Our analysis says you are looking for {reco_field} jobs ({ranking})")
+                    rec_course = course_recommender(reco_field)
 
                 # Insert into DB
-                ts = time.time()
-                cur_date = datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                cur_time = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
-                timestamp = str(cur_date + '_' + cur_time)
+                timestamp = db.make_timestamp()
 
                 # Resume writing recommendation (case-insensitive checks)
                 st.subheader("**Resume Tips & Ideas💡**")
-                resume_score = 0
-                if 'objective' in resume_text_lower:
-                    resume_score += 20
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Objective</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #white;'>[-] Please add your career objective, it will give your career intension to the Recruiters.</h5>''', unsafe_allow_html=True)
-
-                if 'experience' in resume_text_lower:
-                    resume_score += 20
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #white;'>[-] Please add Experience. It will give the assurance that everything written on your resume is true and fully acknowledged by you</h5>''', unsafe_allow_html=True)
-
-                if ('hobbies' in resume_text_lower) or ('interests' in resume_text_lower):
-                    resume_score += 20
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies/Interests</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #white;'>[-] Please add Hobbies/Interests. It will show your personality to the Recruiters.</h5>''', unsafe_allow_html=True)
-
-                if 'achievements' in resume_text_lower:
-                    resume_score += 20
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #white;'>[-] Please add Achievements. It will show that you are capable for the required position.</h5>''', unsafe_allow_html=True)
-
-                if 'projects' in resume_text_lower:
-                    resume_score += 20
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h5>''', unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #white;'>[-] Please add Projects. It will show that you have done work related to the required position.</h5>''', unsafe_allow_html=True)
+                resume_score = analysis["resume_score"]
+                for label, present in analysis["score_sections"].items():
+                    good, bad = SCORE_MESSAGES[label]
+                    st.markdown(good if present else bad, unsafe_allow_html=True)
 
                 # Progress display
                 st.subheader("**Resume Score📝**")
@@ -440,13 +411,8 @@ def run():
                     </style>""",
                     unsafe_allow_html=True,
                 )
-                my_bar = st.progress(0)
-                score = 0
-                for percent_complete in range(resume_score):
-                    score += 1
-                    time.sleep(0.01)
-                    my_bar.progress(min(percent_complete + 1, 100))
-                st.success('** Your Resume Writing Score: ' + str(score) + '**')
+                st.progress(min(resume_score, 100))
+                st.success('** Your Resume Writing Score: ' + str(resume_score) + '**')
                 st.warning("** Note: This score is calculated based on the content that you have in your Resume. **")
                 st.balloons()
 
@@ -461,44 +427,45 @@ def run():
                     cand_level,
                     str(resume_data.get('skills')),
                     str(recommended_skills),
-                    str(rec_course)
+                    str(rec_course),
+                    resume_key=key,
+                    dup_group=dup_group,
+                    minhash_hex=resume_data.get('minhash'),
                 )
+                search_index = get_search_index()
+                if search_index is not None:
+                    search_index.add(key, resume_data.get('name'), resume_data.get('email'),
+                                     resume_data.get('skills') or [], reco_field, cand_level, resume_score,
+                                     timestamp, resume_data.get('text', ''))
 
                 # Bonus videos
                 st.header("**Bonus Video for Resume Writing Tips💡**")
                 resume_vid = random.choice(resume_videos)
-                res_vid_title = fetch_yt_video(resume_vid)
+                res_vid_title = fetch_yt_video(resume_vid, "Resume Writing Tips")
                 st.subheader("✅ **" + res_vid_title + "**")
                 st.video(resume_vid)
 
                 st.header("**Bonus Video for Interview Tips💡**")
                 interview_vid = random.choice(interview_videos)
-                int_vid_title = fetch_yt_video(interview_vid)
+                int_vid_title = fetch_yt_video(interview_vid, "Interview Tips")
                 st.subheader("✅ **" + int_vid_title + "**")
                 st.video(interview_vid)
-
-                connection.commit()
             else:
                 st.error('Something went wrong..')
 
     else:  # Admin side
         st.success('Welcome to Admin Side')
-        ad_user = st.text_input("Username")
-        ad_password = st.text_input("Password", type='password')
-        if st.button('Login'):
-            if ad_user == 'Nandani' and ad_password == '12345':
-                st.success("Welcome Nandani !")
-                cursor.execute('''SELECT * FROM user_data''')
-                data = cursor.fetchall()
-                st.header("**User's Data**")
-                df = pd.DataFrame(data, columns=['ID', 'Name', 'Email', 'Resume Score', 'Timestamp', 'Total Page',
-                                                 'Predicted Field', 'User Level', 'Actual Skills', 'Recommended Skills',
-                                                 'Recommended Course'])
-                st.dataframe(df)
-                st.markdown(get_table_download_link(df, 'User_Data.csv', 'Download Report'), unsafe_allow_html=True)
-                query = 'select * from user_data;'
-                plot_data = pd.read_sql(query, connection)
-            else:
-                st.error("Invalid username or password. Please try again.")
+        if not st.session_state.get('admin_logged_in'):
+            ad_user = st.text_input("Username")
+            ad_password = st.text_input("Password", type='password')
+            if st.button('Login'):
+                if ad_user == 'Nandani' and ad_password == '12345':
+                    st.session_state['admin_logged_in'] = True
+                else:
+                    st.error("Invalid username or password. Please try again.")
+        if st.session_state.get('admin_logged_in'):
+            st.success("Welcome Nandani !")
+            admin_dashboard()
+
 if __name__ == "__main__":
     run()
@@ -0,0 +1,275 @@
+# batch.py
+"""Headless bulk ingestion: parse a directory (or manifest) of resumes in parallel.
+
+Example:
+    python batch.py "Uploaded Resume" -o results.jsonl --workers 4 --db
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+OUTPUT_FIELDS = [
+    "path", "sha256", "name", "email", "mobile_number", "profiles", "skills", "no_of_pages",
+    "reco_field", "cand_level", "resume_score", "recommended_skills", "dup_group", "error",
+]
+
+_timeout = 0
+
+
+def _init_worker(timeout: int) -> None:
+    """Per-process setup: load the spaCy pipeline once per worker."""
+    global _timeout
+    _timeout = timeout
+    from resume_parser import get_nlp
+    get_nlp()
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError(f"parse exceeded {_timeout}s")
+
+
+class _deadline:
+    """Raise TimeoutError in this (worker) process after `seconds`, where SIGALRM exists."""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds if hasattr(signal, "SIGALRM") else 0
+
+    def __enter__(self):
+        if self.seconds > 0:
+            signal.signal(signal.SIGALRM, _on_alarm)
+            signal.alarm(self.seconds)
+
+    def __exit__(self, *exc) -> None:
+        if self.seconds > 0:
+            signal.alarm(0)
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _row(path: str, data: dict, analysis: dict) -> dict:
+    row = {"path": path, "sha256": _sha256(path), "error": ""}
+    row.update({k: data.get(k) for k in ("name", "email", "mobile_number", "profiles", "skills", "no_of_pages", "minhash", "text")})
+    row.update({k: analysis[k] for k in ("reco_field", "cand_level", "resume_score", "recommended_skills")})
+    return row
+
+
+def _error_row(path: str, e: Exception) -> dict:
+    return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_one(path: str) -> dict:
+    """Parse and analyze one file; errors are reported in the row, not raised."""
+    from resume_parser import analyze_resume, parse_resume
+
+    try:
+        with _deadline(_timeout):
+            data = parse_resume(path)
+            return _row(path, data, analyze_resume(data))
+    except Exception as e:
+        return _error_row(path, e)
+
+
+def _load(path: str):
+    """Open a PDF and do the per-file extraction up front (text, layout, links: where a bad PDF can hang)."""
+    from resume_parser import PdfDocument
+
+    doc = PdfDocument(path)
+    try:
+        doc.text, doc.sections, doc.link_uris
+    except BaseException:
+        doc.close()
+        raise
+    return doc
+
+
+def parse_chunk(paths: list[str]) -> list[dict]:
+    """Parse a chunk with batched NER and field classification.
+
+    Each file is read under its own --timeout, so a hung or broken file fails
+    alone. The batched steps then run on the text already read, within one
+    file's timeout; if they fail, the files read are parsed one by one.
+    """
+    from resume_parser import analyze_resumes, parse_documents
+
+    rows, docs = {}, {}
+    with ExitStack() as stack:
+        for p in paths:
+            try:
+                with _deadline(_timeout):
+                    docs[p] = stack.enter_context(_load(p))
+            except Exception as e:
+                rows[p] = _error_row(p, e)
+        try:
+            with _deadline(_timeout):
+                parsed = parse_documents(list(docs.values()))
+                rows.update((p, _row(p, data, analysis))
+                            for p, data, analysis in zip(docs, parsed, analyze_resumes(parsed)))
+        except Exception:
+            rows.update((p, parse_one(p)) for p in docs)
+    return [rows[p] for p in paths]
+
+
+def collect_paths(source: str | None, manifest: str | None) -> list[str]:
+    paths = []
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            paths.extend(ln.strip() for ln in f if ln.strip())
+    if source:
+        for root, _dirs, files in os.walk(source):
+            paths.extend(os.path.join(root, fn) for fn in files if fn.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def load_checkpoint(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {ln.rstrip("\n") for ln in f if ln.strip()}
+
+
+class RowWriter:
+    """Append rows to a JSONL or CSV file, flushing after every row."""
+
+    def __init__(self, path: str, fmt: str):
+        self.fmt = fmt
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._f, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            if new_file:
+                self._csv.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self._csv is not None:
+            flat = {k: "; ".join(v) if isinstance(v, list) else v for k, v in row.items()}
+            self._csv.writerow(flat)
+        else:
+            self._f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def _save_checkpoint(ckpt, unsaved: list[str]) -> None:
+    if unsaved:
+        ckpt.write("".join(p + "\n" for p in unsaved))
+        ckpt.flush()
+        unsaved.clear()
+
+
+def db_row(row: dict, timestamp: str) -> tuple:
+    import db
+    return db.make_row(row.get("name"), row.get("email"), row.get("resume_score"), timestamp,
+                       row.get("no_of_pages"), row.get("reco_field"), row.get("cand_level"),
+                       str(row.get("skills")), str(row.get("recommended_skills")), str([]),
+                       resume_key=row.get("sha256"), dup_group=row.get("dup_group"), minhash=row.get("minhash"))
+
+
+def run_batch(paths: list[str], output: str, fmt: str, workers: int, chunk_size: int, timeout: int,
+              checkpoint: str, to_db: bool = False, db_batch: int = 500, index_path: str | None = None) -> dict:
+    done = load_checkpoint(checkpoint)
+    todo = [p for p in paths if p not in done]
+    stats = {"total": len(paths), "skipped": len(paths) - len(todo), "parsed": 0, "failed": 0}
+    if not todo:
+        return stats
+
+    import db
+    from resume_parser import LshIndex, minhash
+
+    connection = None
+    pending = []
+    if to_db:
+        connection = db.connect()
+        db.create_table(connection)
+    # Near-duplicates are grouped against earlier rows in the DB as well as within this run.
+    dup_index = db.load_duplicate_index(connection) if connection is not None else LshIndex()
+    search_index = None
+    if index_path:
+        from search import CandidateIndex
+        search_index = CandidateIndex(index_path)
+
+    writer = RowWriter(output, fmt)
+    unsaved = []  # paths written but not yet checkpointed
+    try:
+        with open(checkpoint, "a", encoding="utf-8") as ckpt, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(timeout,)) as pool:
+            chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+            rows = (row for chunk_rows in pool.map(parse_chunk, chunks) for row in chunk_rows)
+            for row in rows:
+                text = row.pop("text", "")
+                timestamp = db.make_timestamp()
+                if not row["error"]:
+                    row["dup_group"] = dup_index.add(row["sha256"], minhash.from_hex(row.get("minhash")))
+                    if search_index is not None:
+                        search_index.add(row["sha256"], row["name"], row["email"], row["skills"], row["reco_field"],
+                                         row["cand_level"], row["resume_score"], timestamp, text, commit=False)
+                writer.write(row)
+                unsaved.append(row["path"])
+                if row["error"]:
+                    stats["failed"] += 1
+                else:
+                    stats["parsed"] += 1
+                    if connection is not None:
+                        pending.append(db_row(row, timestamp))
+                if connection is not None and len(pending) >= db_batch:
+                    db.insert_many(connection, pending)
+                    pending = []
+                # A path is only checkpointed once its row is also in the DB.
+                if not pending:
+                    if search_index is not None:
+                        search_index.commit()
+                    _save_checkpoint(ckpt, unsaved)
+            if pending:
+                db.insert_many(connection, pending)
+            if search_index is not None:
+                search_index.commit()
+            _save_checkpoint(ckpt, unsaved)
+    finally:
+        writer.close()
+        if search_index is not None:
+            search_index.close()
+        if connection is not None:
+            connection.close()
+    return stats
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Parse a directory of resumes in parallel.")
+    ap.add_argument("source", nargs="?", help="directory to walk for *.pdf files")
+    ap.add_argument("--manifest", help="text file with one PDF path per line")
+    ap.add_argument("-o", "--output", default="results.jsonl", help="output file (.jsonl or .csv)")
+    ap.add_argument("--format", choices=["jsonl", "csv"], help="output format (default: from extension)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=8, help="files handed to a worker at a time")
+    ap.add_argument("--timeout", type=int, default=60, help="per-file timeout in seconds (0 = none)")
+    ap.add_argument("--checkpoint", help="completed-paths file (default: <output>.checkpoint)")
+    ap.add_argument("--db", action="store_true", help="also insert rows into user_data")
+    ap.add_argument("--db-batch", type=int, default=500, help="rows per bulk insert")
+    ap.add_argument("--index", help="also add rows to this candidate search index (see search.py)")
+    args = ap.parse_args(argv)
+
+    if not args.source and not args.manifest:
+        ap.error("give a source directory and/or --manifest")
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    checkpoint = args.checkpoint or args.output + ".checkpoint"
+
+    paths = collect_paths(args.source, args.manifest)
+    stats = run_batch(paths, args.output, fmt, args.workers, args.chunk_size, args.timeout,
+                      checkpoint, to_db=args.db, db_batch=args.db_batch, index_path=args.index)
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+# benchmark.py
+"""Reproducible benchmarks for the parse pipeline on a synthetic resume corpus.
+
+Generate a corpus (deterministic for a given seed), then benchmark it:
+
+    python benchmark.py generate bench_corpus --count 200 --pages 1-3 --layouts single,two-column,plain-name
+    python benchmark.py run bench_corpus -o bench.json --workers 4
+    python benchmark.py run bench_corpus -o new.json --compare bench.json
+
+Results are written as JSON so runs from different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Isha",
+               "Daniel", "Maria", "James", "Sofia", "Liam", "Emma", "Noah", "Olivia", "Lucas", "Mia"]
+LAST_NAMES = ["Sharma", "Verma", "Agrawal", "Iyer", "Reddy", "Kaushik", "Mehta", "Nair", "Gupta", "Singh",
+              "Smith", "Garcia", "Johnson", "Brown", "Martinez", "Lee", "Walker", "Young", "King", "Scott"]
+FILLER = ("Worked closely with cross-functional teams to deliver features on schedule while improving "
+          "reliability, documentation and onboarding for new contributors across several releases").split()
+SECTIONS = ["Objective", "Experience", "Projects", "Achievements", "Hobbies"]
+LAYOUTS = ["single", "two-column", "plain-name"]
+
+PAGE_W, PAGE_H, MARGIN = 595, 842, 50
+
+
+# -------------------------
+# Corpus generation
+# -------------------------
+def _sentence(rng: random.Random, terms: list[str], skill_density: float) -> str:
+    words = rng.sample(FILLER, rng.randint(8, 16))
+    if terms and rng.random() < skill_density:
+        words.insert(rng.randrange(len(words)), rng.choice(terms))
+    return " ".join(words).capitalize() + "."
+
+
+def _body_lines(rng: random.Random, pages: int, terms: list[str], skill_density: float) -> list[tuple[str, int]]:
+    """(text, font size) lines for the body; headings are larger."""
+    lines = []
+    per_page = 48
+    while len(lines) < pages * per_page - 12:
+        heading = rng.choice(SECTIONS)
+        lines.append((heading.upper(), 13))
+        for _ in range(rng.randint(4, 9)):
+            lines.append((_sentence(rng, terms, skill_density), 9))
+    return lines
+
+
+def make_resume(rng: random.Random, pages: int, layout: str, skill_density: float, terms: list[str]) -> tuple[bytes, dict]:
+    """Build one synthetic resume PDF; returns (pdf bytes, ground truth)."""
+    import fitz
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = name.lower().replace(" ", ".") + f"{rng.randint(1, 99)}@example.com"
+    phone = f"+91 9{rng.randint(100000000, 999999999)}"
+    skills = sorted(rng.sample(terms, min(len(terms), max(1, int(12 * skill_density)))))
+
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_W, height=PAGE_H)
+    name_size = 11 if layout == "plain-name" else 22
+    y = MARGIN + name_size
+    page.insert_text((MARGIN, y), name, fontsize=name_size)
+    y += 18
+    page.insert_text((MARGIN, y), f"{email} | {phone}", fontsize=9)
+    y += 24
+
+    if layout == "two-column":
+        col_x, text_x, width = MARGIN, MARGIN + 150, PAGE_W - 2 * MARGIN - 150
+        page.insert_text((col_x, y), "SKILLS", fontsize=13)
+        for i, skill in enumerate(skills):
+            page.insert_text((col_x, y + 16 + 12 * i), skill, fontsize=9)
+    else:
+        text_x, width = MARGIN, PAGE_W - 2 * MARGIN
+        page.insert_text((text_x, y), "SKILLS", fontsize=13)
+        page.insert_textbox(fitz.Rect(text_x, y + 6, text_x + width, y + 40), ", ".join(skills), fontsize=9)
+        y += 44
+
+    for text, size in _body_lines(rng, pages, terms, skill_density):
+        height = 14 if size > 9 else 12 * (1 + len(text) // 90)
+        if y + height > PAGE_H - MARGIN:
+            if doc.page_count >= pages:
+                break
+            page = doc.new_page(width=PAGE_W, height=PAGE_H)
+            y = MARGIN
+        page.insert_textbox(fitz.Rect(text_x, y, text_x + width, y + height + 4), text, fontsize=size)
+        y += height + 4
+
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    truth = {"name": name, "email": email, "phone": phone, "skills": skills,
+             "pages": pages, "layout": layout, "skill_density": skill_density}
+    return data, truth
+
+
+def _parse_range(spec: str) -> tuple[int, int]:
+    lo, _, hi = spec.partition("-")
+    return int(lo), int(hi or lo)
+
+
+def generate(out_dir: str, count: int, pages: str, layouts: list[str], skill_density: float, seed: int) -> None:
+    from resume_parser import get_taxonomy
+
+    rng = random.Random(seed)
+    terms = sorted(get_taxonomy().skills)
+    lo, hi = _parse_range(pages)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+    for i in range(count):
+        layout = layouts[i % len(layouts)]
+        data, truth = make_resume(rng, rng.randint(lo, hi), layout, skill_density, terms)
+        fn = f"resume_{i:05d}.pdf"
+        with open(os.path.join(out_dir, fn), "wb") as f:
+            f.write(data)
+        manifest.append({"file": fn, **truth})
+    with open(os.path.join(out_dir, "truth.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "count": count, "pages": pages, "layouts": layouts,
+                   "skill_density": skill_density, "resumes": manifest}, f, indent=1)
+
+
+# -------------------------
+# Measurement
+# -------------------------
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples: list[float], wall: float | None = None) -> dict:
+    s = sorted(samples)
+    total = wall if wall is not None else sum(s)
+    return {
+        "n": len(s),
+        "mean_ms": round(1000 * sum(s) / len(s), 3) if s else 0.0,
+        "p50_ms": round(1000 * percentile(s, 50), 3),
+        "p95_ms": round(1000 * percentile(s, 95), 3),
+        "p99_ms": round(1000 * percentile(s, 99), 3),
+        "throughput_per_s": round(len(s) / total, 2) if total else 0.0,
+    }
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_single(files: list[str], repeat: int) -> dict:
+    from resume_parser import PdfDocument, parse_resume, predict_field, predict_fields, stream_resume
+    from resume_parser import taxonomy
+    from resume_parser.extract import extract_contacts, extract_name_by_font, extract_name_by_ner, header_text, ner_window
+    from resume_parser.nlp import get_nlp
+
+    load_start = time.perf_counter()
+    get_nlp()
+    results = {"spacy_load": {"seconds": round(time.perf_counter() - load_start, 3)}}
+
+    blobs = []
+    for path in files:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+
+    samples = {k: [] for k in ("parse_resume", "sections", "contacts", "name_font", "name_header_ner", "name_full_text_ner",
+                               "skill_matching", "field_classification")}
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        for data in blobs:
+            samples["parse_resume"].append(_time(parse_resume, data))
+    parse_wall = time.perf_counter() - wall_start
+
+    matcher = taxonomy.get_taxonomy().matcher
+    for data in blobs:
+        with PdfDocument(data) as doc:
+            text = doc.text
+            samples["sections"].append(_time(lambda: doc.sections))
+            samples["contacts"].append(_time(extract_contacts, doc))
+            samples["name_font"].append(_time(extract_name_by_font, doc))
+            samples["name_header_ner"].append(_time(extract_name_by_ner, header_text(doc)))
+            samples["name_full_text_ner"].append(_time(extract_name_by_ner, ner_window(doc)))
+        samples["skill_matching"].append(_time(matcher.hits, text))
+        taxonomy._scan.cache_clear()  # measure the scan, not the memo
+        samples["field_classification"].append(_time(predict_field, text))
+
+    results.update({k: summarize(v, parse_wall if k == "parse_resume" else None) for k, v in samples.items()})
+    contact_samples = [_time(stream_resume, data) for data in blobs]
+    results["stream_name_contacts"] = summarize(contact_samples)
+    texts = [parse_resume(data)["text"] for data in blobs]
+    taxonomy._scan.cache_clear()
+    seconds = _time(predict_fields, texts)
+    results["field_classification_batch"] = {"n": len(texts), "seconds": round(seconds, 4),
+                                             "throughput_per_s": round(len(texts) / seconds, 2) if seconds else 0.0}
+    return results
+
+
+def bench_pool(files: list[str], workers: int, chunk_size: int) -> dict:
+    import batch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.jsonl")
+        start = time.perf_counter()
+        stats = batch.run_batch(files, out, "jsonl", workers, chunk_size, 0, out + ".checkpoint")
+        wall = time.perf_counter() - start
+    return {"workers": workers, "chunk_size": chunk_size, "files": len(files), "failed": stats["failed"],
+            "seconds": round(wall, 3), "throughput_per_s": round(len(files) / wall, 2) if wall else 0.0}
+
+
+def accuracy(files: list[str], truth: dict) -> dict:
+    """Share of resumes whose name/email came out right (guards against 'fast but wrong')."""
+    from resume_parser import parse_resume
+
+    by_file = {r["file"]: r for r in truth.get("resumes", [])}
+    ok_name = ok_email = n = 0
+    for path in files:
+        expected = by_file.get(os.path.basename(path))
+        if expected is None:
+            continue
+        got = parse_resume(path)
+        n += 1
+        ok_name += got["name"] == expected["name"]
+        ok_email += got["email"] == expected["email"]
+    return {"n": n, "name": round(ok_name / n, 3) if n else None, "email": round(ok_email / n, 3) if n else None}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _peak_rss_mb(who) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(who).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(corpus: str, output: str, repeat: int, workers: int, chunk_size: int, limit: int | None) -> dict:
+    files = sorted(os.path.join(corpus, fn) for fn in os.listdir(corpus) if fn.endswith(".pdf"))[:limit]
+    truth = {}
+    truth_path = os.path.join(corpus, "truth.json")
+    if os.path.exists(truth_path):
+        with open(truth_path, encoding="utf-8") as f:
+            truth = json.load(f)
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"path": corpus, "files": len(files), "seed": truth.get("seed")},
+        "single_process": bench_single(files, repeat),
+        "accuracy": accuracy(files, truth),
+    }
+    report["peak_rss_mb"] = _peak_rss_mb(resource.RUSAGE_SELF)
+    if workers > 0:
+        report["pool"] = bench_pool(files, workers, chunk_size)
+        report["pool"]["peak_worker_rss_mb"] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def compare(new: dict, old: dict) -> list[str]:
+    """Lines describing p50/p95 changes per stage between two reports."""
+    lines = [f"baseline {old.get('commit')} -> {new.get('commit')}"]
+    for stage, cur in new["single_process"].items():
+        prev = old.get("single_process", {}).get(stage)
+        if not prev or "p50_ms" not in cur:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if prev[key]:
+                change = 100 * (cur[key] - prev[key]) / prev[key]
+                lines.append(f"{stage:22s} {key:7s} {prev[key]:10.3f} -> {cur[key]:10.3f} ({change:+.1f}%)")
+    if "pool" in new and "pool" in old:
+        lines.append(f"{'pool':22s} files/s {old['pool']['throughput_per_s']:10.2f} -> {new['pool']['throughput_per_s']:10.2f}")
+    return lines
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Synthetic corpus generator and parse benchmarks.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="write a synthetic resume corpus")
+    gen.add_argument("out_dir")
+    gen.add_argument("--count", type=int, default=100)
+    gen.add_argument("--pages", default="1-3", help="page count or range, e.g. 2 or 1-4")
+    gen.add_argument("--layouts", default=",".join(LAYOUTS), help=f"comma-separated subset of {LAYOUTS}")
+    gen.add_argument("--skill-density", type=float, default=0.3, help="share of sentences naming a skill")
+    gen.add_argument("--seed", type=int, default=1234)
+
+    rn = sub.add_parser("run", help="benchmark a corpus and write a JSON report")
+    rn.add_argument("corpus")
+    rn.add_argument("-o", "--output", default="bench.json")
+    rn.add_argument("--repeat", type=int, default=1, help="parse_resume passes over the corpus")
+    rn.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="pool benchmark workers (0 = skip)")
+    rn.add_argument("--chunk-size", type=int, default=8)
+    rn.add_argument("--limit", type=int, help="only use the first N files")
+    rn.add_argument("--compare", help="earlier report to diff against")
+
+    args = ap.parse_args(argv)
+    if args.command == "generate":
+        layouts = [layout for layout in args.layouts.split(",") if layout]
+        unknown = set(layouts) - set(LAYOUTS)
+        if unknown:
+            ap.error(f"unknown layouts: {sorted(unknown)}")
+        generate(args.out_dir, args.count, args.pages, layouts, args.skill_density, args.seed)
+        return 0
+
+    report = run(args.corpus, args.output, args.repeat, args.workers, args.chunk_size, args.limit)
+    print(json.dumps(report["single_process"]["parse_resume"]))
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(report, json.load(f))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
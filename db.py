@@ -0,0 +1,712 @@
+# db.py
+"""Database access for the user_data table, shared by the web app and the batch CLI.
+
+MySQL (credentials in config.py) is the default backend. Setting
+RESUME_DB_SQLITE=<path> switches to a local SQLite file, which is handy for
+tests and for running the app without a MySQL server.
+
+The admin charts read small rollup tables (counts per day, field, level and
+score; skill counts per day, field and level). insert_many keeps them up to
+date in the same transaction as the rows. `python db.py rollup` rebuilds them
+from user_data, e.g. once after upgrading an existing database.
+"""
+import atexit
+import datetime
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from contextlib import closing, contextmanager
+
+from resume_parser import metrics, minhash
+
+DB_TABLE_NAME = 'user_data'
+# Rows the database keeps rejecting are appended here by InsertQueue instead of blocking the writer.
+DEAD_LETTER_PATH = os.environ.get("RESUME_DB_DEAD_LETTER", "user_data_rejected.jsonl")
+
+# NOTE: avoid DEFAULT on TEXT/BLOB columns. Use VARCHAR for short fields.
+TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS " + DB_TABLE_NAME + """ (
+        ID INT NOT NULL AUTO_INCREMENT,
+        Name VARCHAR(500) NOT NULL,
+        email VARCHAR(500) DEFAULT '',
+        resume_score INT DEFAULT 0,
+        Timestamp DATETIME NULL,
+        Page_no VARCHAR(5) DEFAULT '0',
+        Predicted_Field VARCHAR(255) DEFAULT '',
+        User_level VARCHAR(100) DEFAULT '',
+        Actual_skills TEXT,
+        Recommended_skills TEXT,
+        Recommended_courses TEXT,
+        Resume_key VARCHAR(64) NULL,
+        Dup_group VARCHAR(64) NULL,
+        Minhash VARCHAR(512) NULL,
+        PRIMARY KEY (ID),
+        INDEX idx_user_data_timestamp (Timestamp),
+        INDEX idx_user_data_field (Predicted_Field, Timestamp),
+        INDEX idx_user_data_level (User_level),
+        INDEX idx_user_data_score (resume_score),
+        INDEX idx_user_data_dup_group (Dup_group, ID)
+    );
+    """
+)
+
+SQLITE_TABLE_SQL = [
+    "CREATE TABLE IF NOT EXISTS " + DB_TABLE_NAME + """ (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Name VARCHAR(500) NOT NULL,
+        email VARCHAR(500) DEFAULT '',
+        resume_score INTEGER DEFAULT 0,
+        Timestamp DATETIME,
+        Page_no VARCHAR(5) DEFAULT '0',
+        Predicted_Field VARCHAR(255) DEFAULT '',
+        User_level VARCHAR(100) DEFAULT '',
+        Actual_skills TEXT,
+        Recommended_skills TEXT,
+        Recommended_courses TEXT,
+        Resume_key VARCHAR(64),
+        Dup_group VARCHAR(64),
+        Minhash VARCHAR(512)
+    );
+    """,
+    f"CREATE INDEX IF NOT EXISTS idx_user_data_timestamp ON {DB_TABLE_NAME} (Timestamp)",
+    f"CREATE INDEX IF NOT EXISTS idx_user_data_field ON {DB_TABLE_NAME} (Predicted_Field, Timestamp)",
+    f"CREATE INDEX IF NOT EXISTS idx_user_data_level ON {DB_TABLE_NAME} (User_level)",
+    f"CREATE INDEX IF NOT EXISTS idx_user_data_score ON {DB_TABLE_NAME} (resume_score)",
+]
+
+# Columns added after the first release: (name, type), plus the index they need.
+# create_table adds whichever are missing from an existing table.
+ADDED_COLUMNS = [
+    ("Resume_key", "VARCHAR(64)"),  # SHA-256 of the uploaded PDF
+    ("Dup_group", "VARCHAR(64)"),   # Resume_key of the first resume in its near-duplicate cluster
+    ("Minhash", "VARCHAR(512)"),    # hex MinHash signature of the resume text
+]
+DUP_GROUP_INDEX = ("idx_user_data_dup_group", "Dup_group, ID")
+
+# Brings a table created by older versions (VARCHAR Timestamp/score, no indexes) up to date.
+MYSQL_UPGRADE_SQL = [
+    f"UPDATE {DB_TABLE_NAME} SET Timestamp = NULL WHERE Timestamp = ''",
+    f"UPDATE {DB_TABLE_NAME} SET Timestamp = REPLACE(Timestamp, '_', ' ')",
+    f"UPDATE {DB_TABLE_NAME} SET resume_score = '0' WHERE resume_score = '' OR resume_score IS NULL",
+    f"ALTER TABLE {DB_TABLE_NAME} MODIFY Timestamp DATETIME NULL, MODIFY resume_score INT DEFAULT 0, "
+    "ADD INDEX idx_user_data_timestamp (Timestamp), "
+    "ADD INDEX idx_user_data_field (Predicted_Field, Timestamp), "
+    "ADD INDEX idx_user_data_level (User_level), "
+    "ADD INDEX idx_user_data_score (resume_score)",
+]
+
+# Rollups: one row per (day, field, level, score[, skill]). Day is 'YYYY-MM-DD' ('' when the row has no
+# timestamp). Keeping the exact score (a multiple of 20) keeps every admin filter exact and doubles as the
+# score histogram.
+COUNTS_TABLE = DB_TABLE_NAME + "_counts"
+SKILLS_TABLE = DB_TABLE_NAME + "_skills"
+ROLLUP_SQL = [
+    f"""CREATE TABLE IF NOT EXISTS {COUNTS_TABLE} (
+        Day VARCHAR(10) NOT NULL DEFAULT '',
+        Predicted_Field VARCHAR(255) NOT NULL DEFAULT '',
+        User_level VARCHAR(100) NOT NULL DEFAULT '',
+        resume_score INT NOT NULL DEFAULT 0,
+        Count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (Day, Predicted_Field, User_level, resume_score)
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {SKILLS_TABLE} (
+        Day VARCHAR(10) NOT NULL DEFAULT '',
+        Predicted_Field VARCHAR(255) NOT NULL DEFAULT '',
+        User_level VARCHAR(100) NOT NULL DEFAULT '',
+        resume_score INT NOT NULL DEFAULT 0,
+        Skill VARCHAR(100) NOT NULL DEFAULT '',
+        Count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (Day, Predicted_Field, User_level, resume_score, Skill)
+    )""",
+]
+ROLLUP_KEYS = {COUNTS_TABLE: "Day, Predicted_Field, User_level, resume_score",
+               SKILLS_TABLE: "Day, Predicted_Field, User_level, resume_score, Skill"}
+TOP_SKILLS = 15
+
+INSERT_SQL = (
+    f"INSERT INTO {DB_TABLE_NAME} "
+    "(Name, email, resume_score, Timestamp, Page_no, Predicted_Field, User_level, "
+    "Actual_skills, Recommended_skills, Recommended_courses, Resume_key, Dup_group, Minhash) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+def is_sqlite(connection) -> bool:
+    return isinstance(connection, sqlite3.Connection)
+
+
+def sql_for(connection, sql: str) -> str:
+    """Adapt a %s-placeholder statement to the connection's paramstyle."""
+    return sql.replace("%s", "?") if is_sqlite(connection) else sql
+
+
+def connect():
+    """Open a connection: SQLite if $RESUME_DB_SQLITE is set, else MySQL from config.py."""
+    sqlite_path = os.environ.get("RESUME_DB_SQLITE")
+    if sqlite_path:
+        return sqlite3.connect(sqlite_path, check_same_thread=False)
+    # Note: this assumes database 'cv' already exists and your user can connect to it.
+    import pymysql
+    from config import DB_HOST, DB_USER, DB_PASS, DB_NAME
+    return pymysql.connect(host=DB_HOST, user=DB_USER, password=DB_PASS, db=DB_NAME)
+
+
+def create_table(connection) -> None:
+    with closing(connection.cursor()) as cursor:
+        for sql in (SQLITE_TABLE_SQL if is_sqlite(connection) else [TABLE_SQL]):
+            cursor.execute(sql)
+        for sql in ROLLUP_SQL:
+            cursor.execute(sql)
+    connection.commit()
+    add_missing_columns(connection)
+    if "resume_score" not in _columns(connection, SKILLS_TABLE):
+        # Skills rollup from before it was split by score: recreate and refill it.
+        with closing(connection.cursor()) as cursor:
+            cursor.execute(f"DROP TABLE {SKILLS_TABLE}")
+            cursor.execute(ROLLUP_SQL[1])
+        rebuild_rollups(connection)
+
+
+def _columns(connection, table: str) -> set[str]:
+    with closing(connection.cursor()) as cursor:
+        if is_sqlite(connection):
+            cursor.execute(f"PRAGMA table_info({table})")
+            return {row[1] for row in cursor.fetchall()}
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def add_missing_columns(connection) -> None:
+    """Add ADDED_COLUMNS (and their index) to a table created by an older version."""
+    sqlite = is_sqlite(connection)
+    existing = _columns(connection, DB_TABLE_NAME)
+    with closing(connection.cursor()) as cursor:
+        for name, col_type in ADDED_COLUMNS:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {DB_TABLE_NAME} ADD COLUMN {name} {col_type} NULL")
+        index, cols = DUP_GROUP_INDEX
+        if sqlite:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {DB_TABLE_NAME} ({cols})")
+        else:
+            cursor.execute(f"SHOW INDEX FROM {DB_TABLE_NAME} WHERE Key_name = %s", (index,))
+            if not cursor.fetchall():
+                cursor.execute(f"ALTER TABLE {DB_TABLE_NAME} ADD INDEX {index} ({cols})")
+    connection.commit()
+
+
+def upgrade_table(connection) -> None:
+    """One-off migration of an existing MySQL user_data table to the indexed schema."""
+    with closing(connection.cursor()) as cursor:
+        for sql in MYSQL_UPGRADE_SQL:
+            cursor.execute(sql)
+    connection.commit()
+
+
+def make_timestamp(ts: float | None = None) -> str:
+    """Format a timestamp the way the user_data table stores it (DATETIME literal)."""
+    dt = datetime.datetime.fromtimestamp(time.time() if ts is None else ts)
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def make_row(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses,
+             resume_key=None, dup_group=None, minhash=None) -> tuple:
+    return (name, email, int(res_score or 0), timestamp, str(no_of_pages), reco_field, cand_level, skills, recommended_skills, courses,
+            resume_key, dup_group or resume_key, minhash)
+
+
+def insert_data(connection, name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses):
+    insert_many(connection, [make_row(name, email, res_score, timestamp, no_of_pages, reco_field,
+                                      cand_level, skills, recommended_skills, courses)])
+
+
+@metrics.timed("db_insert")
+def insert_many(connection, rows: list[tuple]) -> None:
+    """Insert rows built with make_row in one executemany and one commit."""
+    if not rows:
+        return
+    counts, skills = rollup_deltas((r[2], r[3], r[5], r[6], r[7]) for r in rows)
+    with closing(connection.cursor()) as cursor:
+        cursor.executemany(sql_for(connection, INSERT_SQL), rows)
+        add_to_rollups(connection, cursor, counts, skills)
+    connection.commit()
+    metrics.inc("resume_db_rows_inserted_total", value=len(rows))
+
+
+# -------------------------
+# Rollups
+# -------------------------
+def skill_list(value) -> list[str]:
+    """Actual_skills as stored in user_data (str() of a list) back to a list."""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value.replace("'", '"'))
+        return [str(s) for s in parsed] if isinstance(parsed, list) else []
+    except ValueError:
+        return [s.strip(" '\"") for s in value.strip("[]").split(",") if s.strip(" '\"")]
+
+
+def rollup_deltas(rows) -> tuple[Counter, Counter]:
+    """Rollup increments for (resume_score, Timestamp, Predicted_Field, User_level, Actual_skills) rows."""
+    counts, skills = Counter(), Counter()
+    for score, ts, field, level, actual_skills in rows:
+        dims = (str(ts)[:10] if ts else "", field or "", level or "")
+        dims += (int(score or 0),)
+        counts[dims] += 1
+        for skill in dict.fromkeys(s[:100] for s in skill_list(actual_skills)):
+            skills[dims + (skill,)] += 1
+    return counts, skills
+
+
+def _upsert_sql(connection, table: str) -> str:
+    keys = ROLLUP_KEYS[table]
+    placeholders = ", ".join(["%s"] * (keys.count(",") + 2))
+    sql = f"INSERT INTO {table} ({keys}, Count) VALUES ({placeholders}) "
+    if is_sqlite(connection):
+        return sql_for(connection, sql + f"ON CONFLICT ({keys}) DO UPDATE SET Count = Count + excluded.Count")
+    return sql + "ON DUPLICATE KEY UPDATE Count = Count + VALUES(Count)"
+
+
+def add_to_rollups(connection, cursor, counts: Counter, skills: Counter) -> None:
+    """Add the deltas to the rollup tables; the caller commits."""
+    for table, deltas in ((COUNTS_TABLE, counts), (SKILLS_TABLE, skills)):
+        if deltas:
+            cursor.executemany(_upsert_sql(connection, table), [k + (n,) for k, n in deltas.items()])
+
+
+def rebuild_rollups(connection, batch: int = 5000) -> int:
+    """Recompute the rollup tables from every user_data row; returns rows counted.
+
+    Rows inserted while this runs may be counted twice, so run it with writers stopped.
+    """
+    counts, skills, total = Counter(), Counter(), 0
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(f"SELECT resume_score, Timestamp, Predicted_Field, User_level, Actual_skills "
+                       f"FROM {DB_TABLE_NAME}")
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                break
+            c, s = rollup_deltas(rows)
+            counts.update(c)
+            skills.update(s)
+            total += len(rows)
+    with closing(connection.cursor()) as cursor:
+        for table in (COUNTS_TABLE, SKILLS_TABLE):
+            cursor.execute(f"DELETE FROM {table}")
+        add_to_rollups(connection, cursor, counts, skills)
+    connection.commit()
+    return total
+
+
+# -------------------------
+# Admin queries
+# -------------------------
+# (column, display name) shown in the admin table; the TEXT columns are left out.
+ADMIN_COLUMNS = [
+    ("ID", "ID"),
+    ("Name", "Name"),
+    ("email", "Email"),
+    ("resume_score", "Resume Score"),
+    ("Timestamp", "Timestamp"),
+    ("Page_no", "Total Page"),
+    ("Predicted_Field", "Predicted Field"),
+    ("User_level", "User Level"),
+]
+
+
+def filter_clause(date_from=None, date_to=None, field=None, level=None, min_score=None, max_score=None,
+                  collapse_duplicates=False) -> tuple[str, list]:
+    """WHERE clause (with %s placeholders) and params for the admin filters.
+
+    date_from/date_to are datetime.date values; date_to is inclusive.
+    collapse_duplicates keeps only the newest row of each near-duplicate group.
+    """
+    conds, params = [], []
+    if date_from is not None:
+        conds.append("Timestamp >= %s")
+        params.append(date_from.strftime('%Y-%m-%d 00:00:00'))
+    if date_to is not None:
+        conds.append("Timestamp < %s")
+        params.append((date_to + datetime.timedelta(days=1)).strftime('%Y-%m-%d 00:00:00'))
+    if field:
+        conds.append("Predicted_Field = %s")
+        params.append(field)
+    if level:
+        conds.append("User_level = %s")
+        params.append(level)
+    if min_score is not None:
+        conds.append("resume_score >= %s")
+        params.append(int(min_score))
+    if max_score is not None:
+        conds.append("resume_score <= %s")
+        params.append(int(max_score))
+    if collapse_duplicates:
+        conds.append(f"(Dup_group IS NULL OR NOT EXISTS (SELECT 1 FROM {DB_TABLE_NAME} newer "
+                     f"WHERE newer.Dup_group = {DB_TABLE_NAME}.Dup_group AND newer.ID > {DB_TABLE_NAME}.ID))")
+    return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+
+def _query(connection, sql: str, params) -> list[tuple]:
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql_for(connection, sql), params)
+        return list(cursor.fetchall())
+
+
+def fetch_page(connection, filters: dict, before_id: int | None = None, limit: int = 50) -> list[tuple]:
+    """Newest-first page of ADMIN_COLUMNS rows with ID < before_id (keyset pagination)."""
+    where, params = filter_clause(**filters)
+    if before_id is not None:
+        where += (" AND " if where else " WHERE ") + "ID < %s"
+        params.append(before_id)
+    cols = ", ".join(c for c, _ in ADMIN_COLUMNS)
+    sql = f"SELECT {cols} FROM {DB_TABLE_NAME}{where} ORDER BY ID DESC LIMIT %s"
+    return _query(connection, sql, params + [int(limit)])
+
+
+def rollup_clause(date_from=None, date_to=None, field=None, level=None, min_score=None, max_score=None,
+                  collapse_duplicates=False) -> tuple[str, list]:
+    """WHERE clause and params for the admin filters over a rollup table.
+
+    The rollups count every row, so collapse_duplicates has no effect here.
+    """
+    conds, params = [], []
+    if date_from is not None:
+        conds.append("Day >= %s")
+        params.append(date_from.strftime('%Y-%m-%d'))
+    if date_to is not None:
+        conds.append("Day <= %s AND Day <> ''")
+        params.append(date_to.strftime('%Y-%m-%d'))
+    if field:
+        conds.append("Predicted_Field = %s")
+        params.append(field)
+    if level:
+        conds.append("User_level = %s")
+        params.append(level)
+    if min_score is not None:
+        conds.append("resume_score >= %s")
+        params.append(int(min_score))
+    if max_score is not None:
+        conds.append("resume_score <= %s")
+        params.append(int(max_score))
+    return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+
+def summary_stats(connection, filters: dict) -> dict:
+    """Counts, average score, per-field/level/day counts, score histogram and top skills.
+
+    Read from the rollup tables only, so the cost depends on the number of
+    days, fields and levels, not on the number of stored resumes.
+    """
+    where, params = rollup_clause(**filters)
+    total, score_sum = _query(connection, f"SELECT SUM(Count), SUM(resume_score * Count) FROM {COUNTS_TABLE}{where}",
+                              params)[0]
+    by_field = _query(connection, f"SELECT Predicted_Field, SUM(Count) AS n FROM {COUNTS_TABLE}{where} "
+                                  "GROUP BY Predicted_Field ORDER BY n DESC", params)
+    by_level = _query(connection, f"SELECT User_level, SUM(Count) AS n FROM {COUNTS_TABLE}{where} "
+                                  "GROUP BY User_level ORDER BY n DESC", params)
+    by_day = _query(connection, f"SELECT Day, SUM(Count) FROM {COUNTS_TABLE}{where} GROUP BY Day ORDER BY Day", params)
+    by_score = _query(connection, f"SELECT resume_score, SUM(Count) FROM {COUNTS_TABLE}{where} "
+                                  "GROUP BY resume_score", params)
+    histogram = Counter()
+    for score, n in by_score:
+        bucket = min(int(score) // 10 * 10, 90)
+        histogram[f"{bucket}-{bucket + 9 if bucket < 90 else 100}"] += int(n)
+    top_skills = _query(connection, f"SELECT Skill, SUM(Count) AS n FROM {SKILLS_TABLE}{where} "
+                                    "GROUP BY Skill ORDER BY n DESC, Skill LIMIT %s", params + [TOP_SKILLS])
+    total = int(total or 0)
+    return {
+        "total": total,
+        "avg_score": float(score_sum) / total if total else None,
+        "by_field": [(f, int(n)) for f, n in by_field],
+        "by_level": [(lv, int(n)) for lv, n in by_level],
+        "by_day": [(d, int(n)) for d, n in by_day if d],
+        "score_histogram": sorted(histogram.items(), key=lambda kv: int(kv[0].split("-")[0])),
+        "top_skills": [(sk, int(n)) for sk, n in top_skills],
+    }
+
+
+# -------------------------
+# Near-duplicates
+# -------------------------
+def load_duplicate_index(connection, threshold: float = minhash.DEFAULT_THRESHOLD) -> minhash.LshIndex:
+    """LSH index of every stored resume signature, with the groups already assigned."""
+    index = minhash.LshIndex(threshold)
+    rows = _query(connection, f"SELECT Resume_key, Dup_group, Minhash FROM {DB_TABLE_NAME} "
+                              "WHERE Minhash IS NOT NULL AND Resume_key IS NOT NULL ORDER BY ID", [])
+    for key, group, sig in rows:
+        index.load(key, minhash.from_hex(sig), group)
+    return index
+
+
+def regroup_duplicates(connection, threshold: float = minhash.DEFAULT_THRESHOLD) -> int:
+    """Recompute Dup_group for every row with a signature, oldest first; returns rows changed."""
+    index = minhash.LshIndex(threshold)
+    rows = _query(connection, f"SELECT ID, Resume_key, Dup_group, Minhash FROM {DB_TABLE_NAME} "
+                              "WHERE Minhash IS NOT NULL AND Resume_key IS NOT NULL ORDER BY ID", [])
+    updates = []
+    for row_id, key, group, sig in rows:
+        new_group = index.add(key, minhash.from_hex(sig))
+        if new_group != group:
+            updates.append((new_group, row_id))
+    with closing(connection.cursor()) as cursor:
+        cursor.executemany(sql_for(connection, f"UPDATE {DB_TABLE_NAME} SET Dup_group = %s WHERE ID = %s"), updates)
+    connection.commit()
+    return len(updates)
+
+
+# -------------------------
+# Connection pool
+# -------------------------
+class ConnectionPool:
+    """Thread-safe pool: each caller checks out its own connection instead of sharing one cursor."""
+
+    def __init__(self, factory=connect, size: int = 5, timeout: float = 10.0):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        """Check out a healthy connection; it is returned to the pool on success, dropped on error."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no database connection free after {self.timeout}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except Exception:
+            if conn is not None:
+                _close_quietly(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._release(conn)
+            self._slots.release()
+
+    def _release(self, conn) -> None:
+        try:
+            # End any read transaction so the next user doesn't see a stale snapshot.
+            conn.rollback()
+        except Exception:
+            _close_quietly(conn)
+            return
+        self._idle.put(conn)
+
+    def _checkout(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self.factory()
+            if _healthy(conn):
+                return conn
+            _close_quietly(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _healthy(conn) -> bool:
+    try:
+        if is_sqlite(conn):
+            conn.execute("SELECT 1")
+        else:
+            conn.ping(reconnect=True)  # reconnects a dropped MySQL socket in place
+        return True
+    except Exception:
+        return False
+
+
+def _rollback_quietly(conn) -> None:
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+# -------------------------
+# Write-behind inserts
+# -------------------------
+class InsertQueue:
+    """Buffer user_data rows and flush them with executemany in batches.
+
+    A flush happens when `batch_size` rows are waiting or `flush_interval`
+    seconds have passed since the oldest one arrived. Once `max_pending` rows
+    are queued, `put` waits at most `put_timeout` seconds and then raises
+    queue.Full, so a stalled database applies backpressure without hanging the
+    caller. Rows taken off the queue stay in the writer's own retry list until
+    they are written; while nothing can be written, no more than a batch is
+    taken off the queue. When a batch fails its rows are retried one by one: a
+    row that keeps failing while others go in (bad data, not an outage) is
+    moved to the JSON-lines `dead_letter_path` after `max_attempts` tries.
+    """
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = 50, flush_interval: float = 2.0,
+                 max_pending: int = 10000, put_timeout: float = 5.0, max_attempts: int = 3,
+                 dead_letter_path: str = DEAD_LETTER_PATH):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_attempts = max_attempts
+        self.dead_letter_path = dead_letter_path
+        self._rows: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._pending: deque = deque()  # [row, failures, last error] taken off the queue, not yet written; guarded by _flush_lock
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="user-data-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, row: tuple, timeout: float | None = None) -> None:
+        """Queue a row; raises queue.Full if there is still no room after the timeout."""
+        self._rows.put(row, timeout=self.put_timeout if timeout is None else timeout)
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written.
+
+        Never blocks on the queue. If nothing could be written (the database is
+        down) the rows stay in the retry list for the next flush and the error
+        is raised.
+        """
+        with self._flush_lock:
+            written, drained, probed, failed, error = 0, False, False, [], None
+            try:
+                while True:
+                    if not self._pending:
+                        if written and not drained:
+                            rows, drained = self._take_queued(), True
+                        elif not written and not probed:
+                            # Nothing went in yet (maybe an outage): take at most one batch, retries included.
+                            rows, probed = self._take_queued(self.batch_size - len(failed)), True
+                        else:
+                            break
+                        if not rows:
+                            break
+                        self._pending.extend([row, 0, None] for row in rows)
+                    chunk = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                    try:
+                        with self.pool.connection() as conn:
+                            insert_many(conn, [entry[0] for entry in chunk])
+                        written += len(chunk)
+                        continue
+                    except Exception as e:
+                        error = e
+                    # Find the rows the database rejects instead of retrying the whole batch forever.
+                    try:
+                        with self.pool.connection() as conn:
+                            for entry in chunk:
+                                try:
+                                    insert_many(conn, [entry[0]])
+                                    written += 1
+                                except Exception as e:
+                                    error = entry[2] = e
+                                    failed.append(entry)
+                                    _rollback_quietly(conn)
+                    except Exception as e:
+                        error = e  # no connection at all: an outage, not bad rows, so stop here
+                        self._pending.extendleft(reversed(chunk))
+                        break
+            finally:
+                # Failures only count against a row once other rows went in, i.e. the database is up.
+                if written:
+                    for entry in failed:
+                        entry[1] += 1
+                    rejected = [entry for entry in failed if entry[1] >= self.max_attempts]
+                    if rejected and self._dead_letter(rejected):
+                        failed = [entry for entry in failed if entry[1] < self.max_attempts]
+                self._pending.extendleft(reversed(failed))
+            if error is not None and not written:
+                raise error
+            return written
+
+    def _dead_letter(self, entries: list[list]) -> bool:
+        """Append rejected rows to the dead-letter file; False (keep retrying them) if it cannot be written."""
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for row, _, error in entries:
+                    f.write(json.dumps({"error": f"{type(error).__name__}: {error}", "row": row}, default=str) + "\n")
+        except OSError:
+            return False
+        metrics.inc("resume_db_rows_rejected_total", value=len(entries))
+        return True
+
+    def _take_queued(self, limit: int | None = None) -> list[tuple]:
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self._rows.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def pending(self) -> int:
+        """Rows waiting to be written, queued or retried."""
+        return self._rows.qsize() + len(self._pending)
+
+    def close(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        oldest = None
+        while not self._stop.wait(min(0.2, self.flush_interval)):
+            pending = self.pending()
+            if not pending:
+                oldest = None
+                continue
+            if oldest is None:
+                oldest = time.monotonic()
+            if pending >= self.batch_size or time.monotonic() - oldest >= self.flush_interval:
+                try:
+                    self.flush()
+                    oldest = None
+                except Exception:
+                    time.sleep(self.flush_interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="user_data maintenance")
+    ap.add_argument("command", choices=["create", "upgrade", "dedup", "rollup"],
+                    help="create: create the table; upgrade: migrate an existing MySQL table; "
+                         "dedup: recompute near-duplicate groups; rollup: rebuild the dashboard rollups")
+    ap.add_argument("--threshold", type=float, default=minhash.DEFAULT_THRESHOLD,
+                    help="dedup: MinHash similarity at which two resumes are duplicates")
+    args = ap.parse_args()
+    with closing(connect()) as conn:
+        if args.command == "create":
+            create_table(conn)
+        elif args.command == "upgrade":
+            upgrade_table(conn)
+        elif args.command == "rollup":
+            create_table(conn)
+            print(f"{rebuild_rollups(conn)} rows rolled up")
+        else:
+            print(f"{regroup_duplicates(conn, args.threshold)} rows regrouped")
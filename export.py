@@ -0,0 +1,145 @@
+# export.py
+"""Streaming export of user_data for the admin report.
+
+Rows are read through a server-side cursor in chunks and written straight to
+a temporary file, so memory stays bounded no matter how large the table is.
+Temporary exports live in a per-process directory that is removed at exit;
+files older than EXPORT_TTL_SECS are pruned whenever a new export starts.
+"""
+import atexit
+import csv
+import gzip
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import closing
+
+import db
+
+EXPORT_COLUMNS = db.ADMIN_COLUMNS + [
+    ("Actual_skills", "Actual Skills"),
+    ("Recommended_skills", "Recommended Skills"),
+    ("Recommended_courses", "Recommended Course"),
+]
+
+FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+}
+
+EXPORT_TTL_SECS = int(os.environ.get("RESUME_EXPORT_TTL_SECS", "3600"))
+
+_dir_lock = threading.Lock()
+_export_dir: str | None = None
+
+
+def available_formats() -> list[str]:
+    """FORMATS usable here: parquet only when pyarrow is installed."""
+    return [f for f in FORMATS if f != "parquet" or importlib.util.find_spec("pyarrow") is not None]
+
+
+def export_dir() -> str:
+    """This process's directory for temporary exports (removed at exit)."""
+    global _export_dir
+    with _dir_lock:
+        if _export_dir is None:
+            _export_dir = tempfile.mkdtemp(prefix="user_data_exports_")
+            atexit.register(shutil.rmtree, _export_dir, True)
+        return _export_dir
+
+
+def prune_exports(max_age: float = EXPORT_TTL_SECS) -> None:
+    """Delete temporary exports older than max_age seconds, e.g. left behind by closed sessions."""
+    cutoff = time.time() - max_age
+    with os.scandir(export_dir()) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _server_side_cursor(connection):
+    if db.is_sqlite(connection):
+        return connection.cursor()  # sqlite cursors already step through results lazily
+    import pymysql.cursors
+    return connection.cursor(pymysql.cursors.SSCursor)
+
+
+def iter_chunks(connection, filters: dict, chunk_size: int = 2000):
+    """Yield lists of at most chunk_size rows (EXPORT_COLUMNS order) matching the admin filters."""
+    where, params = db.filter_clause(**filters)
+    cols = ", ".join(c for c, _ in EXPORT_COLUMNS)
+    sql = db.sql_for(connection, f"SELECT {cols} FROM {db.DB_TABLE_NAME}{where} ORDER BY ID")
+    with closing(_server_side_cursor(connection)) as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+
+def _write_csv(chunks, fileobj) -> int:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow([name for _, name in EXPORT_COLUMNS])
+    count = 0
+    for rows in chunks:
+        writer.writerows(rows)
+        count += len(rows)
+    text.flush()
+    text.detach()
+    return count
+
+
+def _write_parquet(chunks, path: str) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    names = [name for _, name in EXPORT_COLUMNS]
+    schema = pa.schema([(name, pa.string()) for name in names])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            arrays = [pa.array([None if v is None else str(v) for v in col], pa.string()) for col in columns]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+def export_user_data(connection, filters: dict, fmt: str = "csv.gz", path: str | None = None,
+                     chunk_size: int = 2000) -> tuple[str, int]:
+    """Write the filtered rows to `path` (a new temp file by default); returns (path, row count)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {sorted(FORMATS)}")
+    temporary = path is None
+    if temporary:
+        prune_exports()
+        fd, path = tempfile.mkstemp(prefix="user_data_", suffix=FORMATS[fmt], dir=export_dir())
+        os.close(fd)
+    try:
+        return path, _write(iter_chunks(connection, filters, chunk_size), fmt, path)
+    except BaseException:
+        if temporary and os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def _write(chunks, fmt: str, path: str) -> int:
+    if fmt == "parquet":
+        return _write_parquet(chunks, path)
+    with open(path, "wb") as raw:
+        if fmt == "csv.gz":
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                return _write_csv(chunks, gz)
+        return _write_csv(chunks, raw)
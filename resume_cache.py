@@ -0,0 +1,129 @@
+# resume_cache.py
+"""Content-addressed cache for parse_resume results.
+
+Entries are keyed on the SHA-256 of the uploaded PDF bytes, so a re-upload of
+the same file (under any name) or a Streamlit rerun skips PDF and NLP work.
+A bounded in-memory LRU tier sits in front of an optional SQLite tier. Each
+entry is stored with the parser/taxonomy version it was made with and is
+treated as a miss once that version changes.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from resume_parser import cache_version, metrics
+
+
+def content_key(data: bytes) -> str:
+    """Return the cache key (hex SHA-256) for raw upload bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    """Two-tier (memory LRU + optional SQLite) cache of parsed resume dicts."""
+
+    def __init__(self, max_entries: int = 256, db_path: str | None = None, max_disk_entries: int = 10000,
+                 version=cache_version):
+        """`version` is a callable returning the current version tag (checked on every read)."""
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._mem: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS parse_cache_accessed ON parse_cache (accessed)")
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(parse_cache)")}
+            if "version" not in columns:
+                # Entries from before versioning have no version and so never match.
+                self._db.execute("ALTER TABLE parse_cache ADD COLUMN version TEXT")
+            self._db.commit()
+
+    def get(self, key: str, record: bool = True) -> dict | None:
+        """Cached value for key, or None.
+
+        With record=False (a lookup on the side, e.g. for a near-duplicate's
+        name) no hit/miss is counted and the entry's recency is left alone.
+        """
+        version = self.version()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None and entry[0] == version:
+                if record:
+                    self._mem.move_to_end(key)
+                    self._record("hit", "memory")
+                return entry[1]
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM parse_cache WHERE key = ? AND version = ?",
+                                       (key, version)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    if record:
+                        self._db.execute("UPDATE parse_cache SET accessed = ? WHERE key = ?", (time.time(), key))
+                        self._db.commit()
+                        self._remember(key, version, value)
+                        self._record("hit", "disk")
+                    return value
+            if record:
+                self._record("miss")
+            return None
+
+    def _record(self, result: str, tier: str | None = None) -> None:
+        if result == "hit":
+            self.hits += 1
+            metrics.inc("resume_cache_requests_total", {"result": "hit", "tier": tier})
+        else:
+            self.misses += 1
+            metrics.inc("resume_cache_requests_total", {"result": "miss"})
+
+    def put(self, key: str, value: dict) -> None:
+        version = self.version()
+        with self._lock:
+            self._remember(key, version, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, value, accessed, version) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), time.time(), version),
+                )
+                self._db.execute(
+                    "DELETE FROM parse_cache WHERE key IN ("
+                    " SELECT key FROM parse_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+                self._db.commit()
+
+    def get_or_parse(self, data: bytes, parse, key: str | None = None) -> dict:
+        """Return the cached result for `data`, calling `parse()` on a miss."""
+        key = key or content_key(data)
+        value = self.get(key)
+        if value is None:
+            value = parse()
+            self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "memory_entries": len(self._mem),
+        }
+
+    def _remember(self, key: str, version: str, value: dict) -> None:
+        self._mem[key] = (version, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
@@ -0,0 +1,134 @@
+# resume_parser/__init__.py
+"""Headless resume parsing: PDF extraction, field prediction, scoring and recommendations.
+
+Importing this package has no Streamlit or database side effects, so it can
+be used from the web app, the batch CLI, the HTTP service or a worker process alike.
+"""
+from contextlib import ExitStack
+
+from . import metrics, minhash
+from .analysis import (
+    analyze_resume,
+    analyze_resumes,
+    candidate_level,
+    predict_field,
+    predict_fields,
+    rank_fields,
+    recommend_courses,
+    score_resume,
+)
+from .classifier import FieldClassifier, get_classifier, rank_fields_batch
+from .document import PdfDocument
+from .extract import (
+    extract_applicant_name,
+    extract_applicant_names,
+    extract_contacts,
+    extract_email,
+    extract_phone,
+    extract_skills,
+    extract_text_from_pdf,
+)
+from .minhash import LshIndex
+from .nlp import get_nlp
+from .sections import section_text, segment, segment_text
+from .stream import stream_resume
+from .taxonomy import Taxonomy, field_counts, get_taxonomy, skills_in
+
+# Bump whenever parse_resume's output changes for the same PDF, so cached results are recomputed.
+PARSER_VERSION = "2"
+
+
+def cache_version() -> str:
+    """Version tag for stored parse results: the parser version and the current taxonomy."""
+    return f"{PARSER_VERSION}:{get_taxonomy().fingerprint}"
+
+
+@metrics.timed("parse_total")
+def parse_resume(source: "str | bytes | memoryview") -> dict:
+    """Parse a resume from a file path or from the PDF bytes themselves."""
+    with PdfDocument(source) as doc:
+        return parse_document(doc)
+
+
+def parse_document(doc: PdfDocument, name: str | None = None, signature=None) -> dict:
+    """parse_resume for an already open document (e.g. one whose text was inspected first).
+
+    A known `name` (e.g. from an earlier version of the same resume) skips name
+    extraction, and a `signature` already computed from doc.text skips the MinHash.
+    """
+    return _resume_fields(doc, name or extract_applicant_name(doc), signature)
+
+
+def parse_resumes(sources: list, batch_size: int = 64) -> list[dict]:
+    """parse_resume for several paths/byte strings, batching the NER name fallbacks through nlp.pipe."""
+    with ExitStack() as stack:
+        return parse_documents([stack.enter_context(PdfDocument(s)) for s in sources], batch_size)
+
+
+def parse_documents(docs: list[PdfDocument], batch_size: int = 64) -> list[dict]:
+    """parse_resumes for already open documents."""
+    names = extract_applicant_names(docs, batch_size=batch_size)
+    return [_resume_fields(doc, name) for doc, name in zip(docs, names)]
+
+
+def _resume_fields(doc: PdfDocument, name: str, signature=None) -> dict:
+    text, pages = extract_text_from_pdf(doc)
+    metrics.observe("resume_document_pages", pages, buckets=metrics.SIZE_BUCKETS)
+    metrics.observe("resume_document_chars", len(text), buckets=metrics.SIZE_BUCKETS)
+    contacts = extract_contacts(doc)
+    data = {
+        "name": name,
+        "email": (contacts["emails"] or [None])[0],
+        "mobile_number": (contacts["phones"] or [None])[0],
+        "emails": contacts["emails"],
+        "phones": contacts["phones"],
+        "profiles": contacts["profiles"],
+        # skills listed under a Skills heading when there is one, else anywhere
+        "skills": extract_skills(section_text(text, doc.sections, "skills") or text),
+        "no_of_pages": pages,
+        "sections": doc.sections,
+        "minhash": minhash.to_hex(minhash.signature(text) if signature is None else signature),
+        "text": text,
+    }
+    return data
+
+
+__all__ = [
+    "FieldClassifier",
+    "LshIndex",
+    "PARSER_VERSION",
+    "PdfDocument",
+    "Taxonomy",
+    "analyze_resume",
+    "analyze_resumes",
+    "cache_version",
+    "candidate_level",
+    "extract_applicant_name",
+    "extract_applicant_names",
+    "extract_contacts",
+    "extract_email",
+    "extract_phone",
+    "extract_skills",
+    "extract_text_from_pdf",
+    "field_counts",
+    "get_classifier",
+    "get_nlp",
+    "get_taxonomy",
+    "metrics",
+    "minhash",
+    "parse_document",
+    "parse_documents",
+    "parse_resume",
+    "parse_resumes",
+    "predict_field",
+    "predict_fields",
+    "rank_fields",
+    "rank_fields_batch",
+    "recommend_courses",
+    "score_resume",
+    "section_text",
+    "segment",
+    "segment_text",
+    "skills_in",
+    "stream_resume",
+]
@@ -0,0 +1,94 @@
+# resume_parser/analysis.py
+"""Field prediction, candidate level, resume scoring and recommendations."""
+import random
+
+from .classifier import rank_fields_batch
+from .metrics import timed
+from .sections import segment_text
+from .taxonomy import get_taxonomy
+
+# (score label, section from sections.SECTION_ALIASES)
+SCORE_SECTIONS = [
+    ('Objective', 'objective'),
+    ('Experience', 'experience'),
+    ('Hobbies/Interests', 'hobbies'),
+    ('Achievements', 'achievements'),
+    ('Projects', 'projects'),
+]
+SECTION_POINTS = 20
+
+
+@timed("field_prediction")
+def rank_fields(text: str) -> list[tuple[str, float]]:
+    """[(field, confidence)] for the resume text, best first; [] when nothing matches."""
+    return rank_fields_batch([text or ""])[0]
+
+
+@timed("field_prediction_batch")
+def predict_fields(texts: list[str]) -> list[str]:
+    """Top field for each text ('' when nothing matches), classified in one batch."""
+    return [ranking[0][0] if ranking else '' for ranking in rank_fields_batch([t or "" for t in texts])]
+
+
+def predict_field(text: str) -> str:
+    """Return the predicted field for the resume text, or '' when nothing matches."""
+    ranking = rank_fields(text)
+    return ranking[0][0] if ranking else ''
+
+
+def candidate_level(pages: int) -> str:
+    if pages == 1:
+        return "Fresher"
+    if pages == 2:
+        return "Intermediate"
+    if pages >= 3:
+        return "Experienced"
+    return ""
+
+
+def score_resume(text: str, sections: dict | None = None) -> tuple[int, dict[str, bool]]:
+    """Return (score, {section label: present}) from the resume's section index.
+
+    Without an index (e.g. a result cached before sections existed) the text is
+    segmented from its plain heading lines.
+    """
+    if sections is None:
+        sections = segment_text(text or "")
+    present = {label: name in sections for label, name in SCORE_SECTIONS}
+    return SECTION_POINTS * sum(present.values()), present
+
+
+def recommend_courses(field: str, n: int = 5, rng: random.Random | None = None) -> list[list[str]]:
+    """Up to n random [name, link] courses for the field."""
+    courses = get_taxonomy().courses.get(field, [])
+    return (rng or random).sample(courses, min(n, len(courses)))
+
+
+def _analysis(resume_data: dict, ranking: list[tuple[str, float]]) -> dict:
+    text = resume_data.get("text", "") or ""
+    try:
+        pages = int(resume_data.get("no_of_pages") or 0)
+    except Exception:
+        pages = 0
+    reco_field = ranking[0][0] if ranking else ''
+    score, sections = score_resume(text, resume_data.get("sections"))
+    return {
+        "reco_field": reco_field,
+        "field_ranking": ranking,
+        "cand_level": candidate_level(pages),
+        "resume_score": score,
+        "score_sections": sections,
+        "recommended_skills": get_taxonomy().recommended_skills.get(reco_field, []),
+    }
+
+
+def analyze_resume(resume_data: dict) -> dict:
+    """Field, level, score and skill recommendations for a parse_resume result."""
+    return _analysis(resume_data, rank_fields(resume_data.get("text", "")))
+
+
+@timed("analysis_batch")
+def analyze_resumes(resumes: list[dict]) -> list[dict]:
+    """analyze_resume for many results, with field classification done as one matrix product."""
+    rankings = rank_fields_batch([r.get("text", "") or "" for r in resumes])
+    return [_analysis(r, ranking) for r, ranking in zip(resumes, rankings)]
@@ -0,0 +1,110 @@
+# resume_parser/classifier.py
+"""Ranked field classification: keyword frequencies times a field-weight matrix.
+
+Each resume becomes a row of sublinear term frequencies over the taxonomy's
+tags (field keywords and canonical skills). One matrix product against a
+(tags x fields) weight matrix scores every field at once, for one resume or
+for a whole batch. Uses scipy.sparse when installed, dense NumPy otherwise.
+"""
+import math
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+from .matcher import FIELD, SKILL
+from .taxonomy import Taxonomy, get_taxonomy, scan
+
+KEYWORD_WEIGHT = 1.0
+# A skill a field recommends is weaker evidence than one of the field's own keywords.
+SKILL_WEIGHT = 0.5
+
+
+def _matrix(values: list[float], rows: list[int], cols: list[int], shape: tuple[int, int]):
+    if sparse is not None:
+        return sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=np.float32)
+    dense = np.zeros(shape, dtype=np.float32)
+    np.add.at(dense, (rows, cols), values)
+    return dense
+
+
+class FieldClassifier:
+    """Scores resumes against every field of one taxonomy."""
+
+    def __init__(self, taxonomy: Taxonomy):
+        self.fields = list(taxonomy.fields)
+        field_ix = {f: i for i, f in enumerate(self.fields)}
+        self.features: dict[tuple[str, str], int] = {}
+        rows, cols, values = [], [], []
+
+        def add(tag, field, weight):
+            rows.append(self.features.setdefault(tag, len(self.features)))
+            cols.append(field_ix[field])
+            values.append(weight)
+
+        for field in self.fields:
+            add((FIELD, field), field, KEYWORD_WEIGHT)
+        # skill -> fields recommending it; a shared skill splits its weight between them
+        canonical = {s.lower(): s for s in taxonomy.skills}
+        recommenders: dict[str, list[str]] = {}
+        for field, skills in taxonomy.recommended_skills.items():
+            for skill in skills:
+                name = canonical.get(skill.lower())
+                if name and field not in recommenders.setdefault(name, []):
+                    recommenders[name].append(field)
+        for name, fields in recommenders.items():
+            for field in fields:
+                add((SKILL, name), field, SKILL_WEIGHT / len(fields))
+
+        self.weights = _matrix(values, rows, cols, (len(self.features), len(self.fields)))
+
+    def vectorize(self, hits: list[Counter]):
+        """(documents x tags) matrix of 1 + log(count) for each tag a document hit."""
+        rows, cols, values = [], [], []
+        for i, counter in enumerate(hits):
+            for tag, n in counter.items():
+                j = self.features.get(tag)
+                if j is not None and n > 0:
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(1.0 + math.log(n))
+        return _matrix(values, rows, cols, (len(hits), len(self.features)))
+
+    def scores(self, hits: list[Counter]) -> np.ndarray:
+        """(documents x fields) dense array of raw field scores."""
+        product = self.vectorize(hits) @ self.weights
+        return product.toarray() if hasattr(product, "toarray") else np.asarray(product)
+
+    def rank(self, hits: list[Counter]) -> list[list[tuple[str, float]]]:
+        """Per document, [(field, confidence)] best first; fields scoring zero are left out.
+
+        Confidence is the field's share of the document's total score. Ties keep
+        taxonomy order.
+        """
+        scores = self.scores(hits)
+        totals = scores.sum(axis=1)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ranked = []
+        for row, total, idx in zip(scores, totals, order):
+            ranked.append([(self.fields[j], round(float(row[j] / total), 3)) for j in idx if row[j] > 0])
+        return ranked
+
+
+@lru_cache(maxsize=4)
+def _classifier(taxonomy: Taxonomy) -> FieldClassifier:
+    return FieldClassifier(taxonomy)
+
+
+def get_classifier() -> FieldClassifier:
+    """Classifier for the current taxonomy (rebuilt when the taxonomy reloads)."""
+    return _classifier(get_taxonomy())
+
+
+def rank_fields_batch(texts: list[str]) -> list[list[tuple[str, float]]]:
+    """Rank fields for many resumes with one matrix product."""
+    return get_classifier().rank([scan(t) for t in texts])
@@ -0,0 +1,136 @@
+# resume_parser/document.py
+import os
+from functools import cached_property
+
+import fitz  # PyMuPDF
+
+from . import metrics, ocr
+from .metrics import timed
+from .sections import segment
+
+# Hard caps on how much of a document is read, so huge uploads cost bounded time and memory.
+MAX_PAGES = int(os.environ.get("RESUME_MAX_PAGES", "10"))
+MAX_CHARS = int(os.environ.get("RESUME_MAX_CHARS", "50000"))
+
+
+class PdfDocument:
+    """Open a PDF once and lazily compute (and memoize) the views the extractors need."""
+
+    @timed("pdf_open")
+    def __init__(self, source: "str | bytes | memoryview", max_pages: int | None = None, max_chars: int | None = None):
+        """Open a file path, or parse the PDF bytes in memory without touching disk."""
+        self.max_pages = MAX_PAGES if max_pages is None else max_pages
+        self.max_chars = MAX_CHARS if max_chars is None else max_chars
+        self._page_texts: list[str] = []
+        self._chars = 0
+        self.truncated = False
+        if isinstance(source, str):
+            self.path = source
+            self._doc = fitz.open(source)
+        else:
+            self.path = None
+            if isinstance(source, memoryview):
+                # PyMuPDF takes bytes/bytearray: reuse the underlying buffer when the view covers all of it.
+                whole = isinstance(source.obj, (bytes, bytearray)) and source.nbytes == len(source.obj)
+                source = source.obj if whole else source.tobytes()
+            self._doc = fitz.open(stream=source, filetype="pdf")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._doc.close()
+
+    @cached_property
+    def page_count(self) -> int:
+        return self._doc.page_count
+
+    def iter_pages(self):
+        """Yield (index, text) page by page up to the page and character caps.
+
+        Pages already read are replayed from memory, so several consumers (or an
+        early-exit loop followed by `text`) share a single extraction pass.
+        """
+        i = 0
+        while True:
+            if i < len(self._page_texts):
+                yield i, self._page_texts[i]
+                i += 1
+                continue
+            if i >= self.page_count:
+                return
+            if i >= self.max_pages or self._chars >= self.max_chars:
+                self._mark_truncated()
+                return
+            page = self._doc[i]
+            page_text = page.get_text("text")
+            if not page_text.strip():
+                # Image-only (scanned) page: OCR it when enabled, else it stays blank.
+                page_text = ocr.ocr_page(page)
+            page_text += "\n"
+            if self._chars + len(page_text) > self.max_chars:
+                page_text = page_text[:self.max_chars - self._chars]
+                self._mark_truncated()
+            self._page_texts.append(page_text)
+            self._chars += len(page_text)
+
+    def _mark_truncated(self) -> None:
+        if not self.truncated:
+            self.truncated = True
+            metrics.inc("resume_documents_truncated_total")
+
+    @property
+    def pages_read(self) -> int:
+        return len(self._page_texts)
+
+    @cached_property
+    @timed("text_extraction")
+    def text(self) -> str:
+        """Text of every page within the caps, newline-separated (joined once)."""
+        return "".join(page_text for _, page_text in self.iter_pages()).strip()
+
+    @cached_property
+    @timed("page_dict")
+    def first_page_dict(self) -> dict:
+        """Span/font dict of the first page (empty when the PDF has no pages)."""
+        if self.page_count == 0:
+            return {}
+        return self._doc[0].get_text("dict")
+
+    def page_dict(self, index: int) -> dict:
+        """Span/font dict of one page (the first one shared with first_page_dict)."""
+        return self.first_page_dict if index == 0 else self._doc[index].get_text("dict")
+
+    @cached_property
+    def page_dicts(self) -> list[dict]:
+        """Span/font dicts of the pages `text` covers."""
+        if self.page_count == 0 or not self.text:
+            return []
+        return [self.page_dict(i) for i in range(self.pages_read)]
+
+    def page_links(self, index: int) -> list[str]:
+        """URIs of the link annotations (mailto:, tel:, https:...) on one page."""
+        return [link["uri"] for link in self._doc[index].get_links() if link.get("uri")]
+
+    @cached_property
+    def link_uris(self) -> list[str]:
+        """Link annotation URIs of every page within the page cap."""
+        return [uri for i in range(min(self.page_count, self.max_pages)) for uri in self.page_links(i)]
+
+    @cached_property
+    def sections(self) -> dict[str, tuple[int, int]]:
+        """Section name -> (start, end) character range into text."""
+        return segment(self.page_dicts, self.text)
+
+    def thumbnails(self, max_pages: int = 2, dpi: int = 60) -> list[bytes]:
+        """PNG renderings of the first pages, for previews."""
+        return [self._doc[i].get_pixmap(dpi=dpi).tobytes("png") for i in range(min(max_pages, self.page_count))]
+
+    @cached_property
+    def header_lines(self) -> list[str]:
+        """Non-empty, stripped lines of the first page (its OCR text for a scanned page)."""
+        text = next(self.iter_pages(), (0, ""))[1]
+        return [ln.strip() for ln in text.splitlines() if ln.strip()]
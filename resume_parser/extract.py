@@ -0,0 +1,264 @@
+# resume_parser/extract.py
+"""Field extractors (name, contact details, skills) that read from a PdfDocument."""
+import os
+import re
+
+import phonenumbers
+
+from . import metrics
+from .document import PdfDocument
+from .metrics import timed
+from .nlp import NER_WINDOW_CHARS, person_entities, person_entities_batch
+from .sections import HEADER, section_text
+from .taxonomy import skills_in
+
+# Heuristics / keywords
+BAD_KEYWORDS = [
+    "resume", "curriculum", "cv", "linkedin", ".com", "email", "phone", "mobile", "tel",
+    "github", "address", "objective", "profile", "summary", "skills", "experience"
+]
+
+# -------------------------
+# Name extraction utilities
+# -------------------------
+def extract_text_from_pdf(doc: PdfDocument) -> tuple[str, int]:
+    """Return (text, number_of_pages)."""
+    return doc.text, doc.page_count
+
+def extract_first_lines(doc: PdfDocument, n_lines: int = 8) -> str:
+    """Return the first n_lines of the first page as a block of text."""
+    return "\n".join(doc.header_lines[:n_lines])
+
+def header_text(doc: PdfDocument) -> str:
+    """Text above the first section heading, or the first lines when no heading was found."""
+    header = section_text(doc.text, doc.sections, HEADER)
+    if header and header.strip():
+        return header[:NER_WINDOW_CHARS]
+    return extract_first_lines(doc, n_lines=10)
+
+def looks_like_name(s: str) -> bool:
+    words = [w for w in s.split() if w.strip()]
+    if len(words) < 2 or len(words) > 4:
+        return False
+    if any(ch.isdigit() for ch in s) or "@" in s or any(tok in s.lower() for tok in BAD_KEYWORDS):
+        return False
+    count_title = sum(1 for w in words if w and (w[0].isupper() or w.isupper()))
+    return count_title >= max(1, len(words)-1)
+
+@timed("name_font")
+def extract_name_by_font(doc: PdfDocument) -> str | None:
+    """Choose the largest text spans on the first page and return best candidate."""
+    data = doc.first_page_dict
+    spans = []
+    for block in data.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                txt = span.get("text", "").strip()
+                if not txt:
+                    continue
+                size = span.get("size", 0)
+                bbox = span.get("bbox", [0,0,0,0])
+                low = txt.lower()
+                if any(tok in low for tok in BAD_KEYWORDS) or "@" in txt or len(txt) < 2:
+                    continue
+                spans.append({"text": txt, "size": size, "y": bbox[1]})
+    if not spans:
+        return None
+    spans.sort(key=lambda s: (-s["size"], s["y"]))
+    for cand in spans[:6]:
+        if looks_like_name(cand["text"]):
+            return cand["text"]
+    return spans[0]["text"]
+
+NAME_LABEL_RE = re.compile(r'(?:Name|Full Name|Candidate)\s*[:\-]\s*([A-Z][A-Za-z\.\s]{1,120})', re.I)
+
+def extract_name_by_label(text: str) -> str | None:
+    """Return the value of an explicit 'Name:' style label, if it looks like a name."""
+    m = NAME_LABEL_RE.search(text)
+    if m:
+        candidate = m.group(1).strip()
+        if looks_like_name(candidate):
+            return candidate
+    return None
+
+def pick_person(persons: list[str]) -> str | None:
+    if not persons:
+        return None
+    for p in persons:
+        if looks_like_name(p):
+            return p
+    return persons[0]
+
+@timed("name_ner")
+def extract_name_by_ner(text: str) -> str | None:
+    """Use regex for explicit 'Name:' patterns and spaCy NER on the provided text chunk."""
+    return extract_name_by_label(text) or pick_person(person_entities(text))
+
+def ner_window(doc: PdfDocument) -> str:
+    """Leading slice of the full text used by the last-resort NER pass."""
+    return (doc.text or "")[:NER_WINDOW_CHARS]
+
+NAME_NOT_FOUND = "Name not found"
+
+def _name_tier(tier: str) -> None:
+    metrics.inc("resume_name_tier_total", {"tier": tier})
+
+def extract_applicant_name(doc: PdfDocument) -> str:
+    # 1) font/layout heuristics
+    try:
+        name = extract_name_by_font(doc)
+        if name:
+            _name_tier("font")
+            return name
+    except Exception:
+        pass
+    # 2) NER on header
+    try:
+        header = header_text(doc)
+        name = extract_name_by_ner(header or "")
+        if name:
+            _name_tier("header_ner")
+            return name
+    except Exception:
+        pass
+    # 3) NER on the leading window of the full text
+    try:
+        name = extract_name_by_ner(ner_window(doc))
+        if name:
+            _name_tier("full_text_ner")
+            return name
+    except Exception:
+        pass
+    _name_tier("none")
+    return NAME_NOT_FOUND
+
+@timed("name_batch")
+def extract_applicant_names(docs: list[PdfDocument], batch_size: int = 64) -> list[str]:
+    """extract_applicant_name for many documents, running each NER tier as one nlp.pipe batch."""
+    names = [None] * len(docs)
+    for i, doc in enumerate(docs):
+        try:
+            names[i] = extract_name_by_font(doc)
+        except Exception:
+            pass
+    tier_counts = {"font": sum(1 for n in names if n)}
+    tiers = (("header_ner", header_text), ("full_text_ner", ner_window))
+    for tier, tier_text in tiers:
+        todo = []
+        for i, name in enumerate(names):
+            if name:
+                continue
+            try:
+                text = tier_text(docs[i]) or ""
+            except Exception:
+                continue
+            names[i] = extract_name_by_label(text)
+            if not names[i]:
+                todo.append((i, text))
+        if todo:
+            try:
+                batches = person_entities_batch([text for _, text in todo], batch_size=batch_size)
+            except Exception:
+                batches = []
+            for (i, _), persons in zip(todo, batches):
+                names[i] = pick_person(persons)
+        tier_counts[tier] = sum(1 for n in names if n) - sum(tier_counts.values())
+    tier_counts["none"] = len(names) - sum(tier_counts.values())
+    for tier, n in tier_counts.items():
+        if n:
+            metrics.inc("resume_name_tier_total", {"tier": tier}, n)
+    return [name or NAME_NOT_FOUND for name in names]
+
+# -------------------------
+# Other extractors
+# -------------------------
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}")
+PROFILE_RE = re.compile(r"(?:https?://)?(?:www\.)?((?:linkedin\.com/in|github\.com)/[\w\-%.]+)", re.I)
+# Digit runs that could be a phone number; only these are handed to phonenumbers.
+PHONE_CANDIDATE_RE = re.compile(r"(?<![\w+(])(?:\+|00|\()?\d[\d \-.()/]{6,18}\d(?!\w)")
+
+# Regions tried, in order, for numbers written without a country code.
+PHONE_REGIONS = [r.strip().upper() for r in os.environ.get("RESUME_PHONE_REGIONS", "IN").split(",") if r.strip()]
+
+def _phone(candidate: str, regions: list[str]) -> str | None:
+    for region in regions:
+        try:
+            number = phonenumbers.parse(candidate, region)
+        except phonenumbers.NumberParseException:
+            continue
+        if phonenumbers.is_valid_number(number):
+            return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+    return None
+
+def find_emails(text: str) -> list[str]:
+    return list(dict.fromkeys(m.group(0).rstrip(".") for m in EMAIL_RE.finditer(text or "")))
+
+def find_phones(text: str, regions: list[str] | None = None) -> list[str]:
+    regions = regions or PHONE_REGIONS
+    found = (_phone(m.group(0), regions) for m in PHONE_CANDIDATE_RE.finditer(text or ""))
+    return list(dict.fromkeys(p for p in found if p))
+
+def find_profiles(text: str) -> list[str]:
+    return list(dict.fromkeys("https://" + m.group(1).rstrip("/.").lower() for m in PROFILE_RE.finditer(text or "")))
+
+@timed("email")
+def extract_email(text: str) -> str | None:
+    match = EMAIL_RE.search(text or "")
+    return match.group(0).rstrip(".") if match else None
+
+@timed("phone")
+def extract_phone(text: str, regions: list[str] | None = None) -> str | None:
+    phones = find_phones(text, regions)
+    return phones[0] if phones else None
+
+def contacts_from_uris(uris: list[str], regions: list[str] | None = None) -> tuple[list, list, list]:
+    """(emails, phones, profiles) from mailto:, tel: and profile link URIs."""
+    regions = regions or PHONE_REGIONS
+    emails, phones, profiles = [], [], []
+    for uri in uris:
+        scheme, _, rest = uri.partition(":")
+        scheme = scheme.lower()
+        if scheme == "mailto":
+            emails += find_emails(rest.split("?")[0])
+        elif scheme == "tel":
+            phones += [p for p in [_phone(rest, regions)] if p]
+        else:
+            profiles += find_profiles(uri)
+    return emails, phones, profiles
+
+@timed("contacts")
+def extract_contacts(doc: PdfDocument, regions: list[str] | None = None) -> dict[str, list[str]]:
+    """All emails, phones and LinkedIn/GitHub URLs.
+
+    Link annotations (mailto:, tel:, https:) and the header are scanned first;
+    the full text is only searched for whatever they did not turn up.
+    """
+    regions = regions or PHONE_REGIONS
+    emails, phones, profiles = contacts_from_uris(doc.link_uris, regions)
+    source = "links" if emails and phones else None
+
+    header = header_text(doc)
+    emails += find_emails(header)
+    phones += find_phones(header, regions)
+    profiles += find_profiles(header)
+    source = source or ("header" if emails and phones else None)
+
+    # Profiles are optional; only a missing email or phone justifies a full-text scan.
+    if not (emails and phones):
+        text = doc.text
+        if not emails:
+            emails = find_emails(text)
+        if not phones:
+            phones = find_phones(text, regions)
+        if not profiles:
+            profiles = find_profiles(text)
+        source = source or "full_text"
+    metrics.inc("resume_contact_source_total", {"source": source})
+    return {"emails": list(dict.fromkeys(emails)), "phones": list(dict.fromkeys(phones)),
+            "profiles": list(dict.fromkeys(profiles))}
+
+@timed("skills")
+def extract_skills(text: str):
+    return skills_in(text)
@@ -0,0 +1,80 @@
+# resume_parser/matcher.py
+"""Single-pass, word-bounded keyword matching for skills and field keywords.
+
+All terms are compiled into one regex whose alternation is factored as a
+prefix trie, so the engine walks the text once and the cost per position
+depends on the trie depth rather than on the number of terms.
+"""
+import re
+from collections import Counter
+
+SKILL = "skill"
+FIELD = "field"
+
+
+def _char_pattern(ch: str) -> str:
+    # A space in a term matches any run of whitespace (PDF text wraps lines).
+    return r"\s+" if ch == " " else re.escape(ch)
+
+
+def _trie_pattern(node: dict) -> str:
+    ends_here = "" in node
+    alts = [_char_pattern(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    if len(alts) == 1 and not ends_here:
+        return alts[0]
+    group = "(?:" + "|".join(alts) + ")"
+    return group + "?" if ends_here else group
+
+
+def compile_terms(terms) -> re.Pattern | None:
+    """Compile lowercase terms into one trie-factored, word-bounded regex."""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)")
+
+
+def _with_subphrase_tags(tags: dict) -> dict:
+    """Let a multi-word term also carry the tags of the terms inside it.
+
+    The regex reports the longest match only, so "react js" must still count
+    as the skill "React".
+    """
+    merged = {}
+    for term, term_tags in tags.items():
+        words = term.split()
+        found = list(dict.fromkeys(term_tags))
+        for i in range(len(words)):
+            for j in range(i + 1, len(words) + 1):
+                sub = " ".join(words[i:j])
+                if sub != term:
+                    found.extend(t for t in tags.get(sub, ()) if t not in found)
+        merged[term] = found
+    return merged
+
+
+class KeywordMatcher:
+    """Map every term to its (kind, label) tags and find them all in one scan."""
+
+    def __init__(self, tags: dict[str, list[tuple[str, str]]], pattern: re.Pattern | None = None):
+        self.tags = _with_subphrase_tags(tags)
+        # Callers may pass the pattern of a matcher with the same terms to skip recompiling.
+        self.pattern = pattern if pattern is not None else compile_terms(tags)
+
+    def hits(self, text: str) -> Counter:
+        """Counter of (kind, label) -> number of matches in text."""
+        counts: Counter = Counter()
+        if self.pattern is None or not text:
+            return counts
+        for m in self.pattern.finditer(text.lower()):
+            term = " ".join(m.group().split())
+            for tag in self.tags.get(term, ()):
+                counts[tag] += 1
+        return counts
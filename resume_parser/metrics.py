@@ -0,0 +1,206 @@
+# resume_parser/metrics.py
+"""Lightweight per-stage timing and counters with Prometheus text export.
+
+Disabled by default; set RESUME_METRICS=1 (or call enable()). While disabled
+a @timed function costs one extra call and a flag check. RESUME_METRICS_FILE
+makes a background thread rewrite that file in Prometheus text format, and
+RESUME_TRACE_LOG appends one JSON line of stage timings per traced request.
+
+Work done in another process can be recorded there inside capture() and the
+returned events replayed into this process's registry with replay().
+"""
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds (seconds for latencies).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 1e3, 1e4, 1e5, 1e6, 1e7)
+
+_enabled = os.environ.get("RESUME_METRICS") == "1"
+_lock = threading.Lock()
+_counters: dict[tuple, float] = {}
+_histograms: dict[tuple, list] = {}  # key -> [bucket counts..., +Inf count, sum]
+_bounds: dict[str, tuple] = {}
+_capture: contextvars.ContextVar = contextvars.ContextVar("resume_metrics_capture", default=None)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name: str, labels: dict | None) -> tuple:
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+
+def inc(name: str, labels: dict | None = None, value: float = 1) -> None:
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    events = _capture.get()
+    if events is not None:
+        events.append(("inc", name, labels, value))
+
+
+def observe(name: str, value: float, labels: dict | None = None, buckets: tuple = LATENCY_BUCKETS) -> None:
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _bounds.setdefault(name, buckets)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(buckets) + 2)
+        hist[bisect.bisect_left(_bounds[name], value)] += 1
+        hist[-1] += value
+    events = _capture.get()
+    if events is not None:
+        events.append(("observe", name, value, labels, buckets))
+
+
+def timed(stage: str):
+    """Decorator recording the wrapped call's latency as resume_stage_seconds{stage=...}."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - start)
+        return inner
+    return wrap
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    observe("resume_stage_seconds", seconds, {"stage": stage})
+
+
+@contextmanager
+def capture():
+    """Collect the metric events recorded inside this block (in this context) into a list."""
+    events: list = []
+    token = _capture.set(events)
+    try:
+        yield events
+    finally:
+        _capture.reset(token)
+
+
+def replay(events: list) -> None:
+    """Apply events captured elsewhere (e.g. in a worker process) to this registry."""
+    for event in events:
+        if event[0] == "inc":
+            inc(*event[1:])
+        else:
+            observe(*event[1:])
+
+
+def log_trace(request_id: str, events: list, total_seconds: float, **fields) -> None:
+    """Append one JSON line with the stage timings in `events` to $RESUME_TRACE_LOG."""
+    path = os.environ.get("RESUME_TRACE_LOG")
+    if not (_enabled and path):
+        return
+    stages = [(e[3]["stage"], round(e[2] * 1000, 3)) for e in events
+              if e[0] == "observe" and e[1] == "resume_stage_seconds"]
+    entry = {"id": request_id, "ts": time.time(), "total_ms": round(total_seconds * 1000, 3),
+             "stages": stages, **fields}
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+@contextmanager
+def request_trace(request_id: str, **fields):
+    """Trace the stages timed inside this block to $RESUME_TRACE_LOG (no-op when disabled)."""
+    if not (_enabled and os.environ.get("RESUME_TRACE_LOG")):
+        yield
+        return
+    start = time.perf_counter()
+    with capture() as events:
+        try:
+            yield
+        finally:
+            log_trace(request_id, events, time.perf_counter() - start, **fields)
+
+
+def _fmt_labels(labels: tuple, extra: tuple = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items())
+        bounds = dict(_bounds)
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+    for (name, labels), hist in histograms:
+        if name not in seen:
+            lines.append(f"# TYPE {name} histogram")
+            seen.add(name)
+        cumulative = 0
+        for bound, n in zip(bounds[name] + (float("inf"),), hist[:-1]):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {hist[-1]:g}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+
+_exporter: threading.Thread | None = None
+
+
+def start_file_exporter(path: str | None = None, interval: float = 15.0) -> None:
+    """Rewrite `path` (default $RESUME_METRICS_FILE) every `interval` seconds, once per process."""
+    global _exporter
+    path = path or os.environ.get("RESUME_METRICS_FILE")
+    if not (_enabled and path) or _exporter is not None:
+        return
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_prometheus(path)
+            except OSError:
+                pass
+
+    _exporter = threading.Thread(target=loop, name="metrics-exporter", daemon=True)
+    _exporter.start()
@@ -0,0 +1,131 @@
+# resume_parser/minhash.py
+"""MinHash signatures of resume text and a banded LSH index for near-duplicates.
+
+Two resumes' signatures agree in roughly the same share of positions as the
+Jaccard similarity of their word shingles. The LSH index buckets signatures
+by bands, so a lookup only compares against resumes sharing a bucket.
+"""
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from .metrics import timed
+
+NUM_PERM = 64
+SHINGLE_WORDS = 5
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 similarity almost always share a bucket
+DEFAULT_THRESHOLD = 0.85
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures are stored, so every process and release must use the same permutations.
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 1 << 32, NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> set[str]:
+    """Overlapping k-word shingles of the lowercased text."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+@timed("minhash")
+def signature(text: str) -> np.ndarray | None:
+    """uint32 MinHash signature of the text, or None when it has no words."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+    # (a*h + b) mod p for every shingle and permutation at once; a, b, h < 2**32 so nothing overflows.
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME & _MASK
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def to_hex(sig: np.ndarray | None) -> str | None:
+    return None if sig is None else sig.tobytes().hex()
+
+
+def from_hex(value: str | None) -> np.ndarray | None:
+    if not value:
+        return None
+    return np.frombuffer(bytes.fromhex(value), dtype=np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two signatures' texts."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LshIndex:
+    """Banded LSH over MinHash signatures, grouping near-duplicate resumes.
+
+    Each resume is indexed under a key (the upload's content hash) and belongs
+    to a duplicate group, named after the first key of its cluster.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: dict[tuple[int, bytes], list[str]] = {}
+        self._signatures: dict[str, np.ndarray] = {}
+        self._groups: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, sig: np.ndarray):
+        for i in range(self.bands):
+            yield i, sig[i * self.rows:(i + 1) * self.rows].tobytes()
+
+    def _match(self, sig: np.ndarray) -> tuple[str, float] | None:
+        candidates = set()
+        for band in self._band_keys(sig):
+            candidates.update(self._buckets.get(band, ()))
+        best = max(((k, similarity(sig, self._signatures[k])) for k in candidates),
+                   key=lambda kv: kv[1], default=None)
+        return best if best is not None and best[1] >= self.threshold else None
+
+    def match(self, sig: np.ndarray | None) -> tuple[str, float] | None:
+        """(key, similarity) of the most similar indexed resume at or above the threshold."""
+        if sig is None:
+            return None
+        with self._lock:
+            return self._match(sig)
+
+    def group_of(self, key: str) -> str | None:
+        return self._groups.get(key)
+
+    def load(self, key: str, sig: np.ndarray | None, group: str | None = None) -> None:
+        """Index a stored resume with its already-known group."""
+        if sig is None:
+            return
+        with self._lock:
+            self._insert(key, sig, group or key)
+
+    def add(self, key: str, sig: np.ndarray | None) -> str:
+        """Index a new resume; returns its group (that of its nearest duplicate, else its own key)."""
+        with self._lock:
+            if key in self._groups:
+                return self._groups[key]
+            if sig is None:
+                return key
+            found = self._match(sig)
+            group = self._groups[found[0]] if found else key
+            self._insert(key, sig, group)
+            return group
+
+    def _insert(self, key: str, sig: np.ndarray, group: str) -> None:
+        if key in self._signatures:
+            return
+        self._signatures[key] = sig
+        self._groups[key] = group
+        for band in self._band_keys(sig):
+            self._buckets.setdefault(band, []).append(key)
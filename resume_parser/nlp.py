@@ -0,0 +1,39 @@
+# resume_parser/nlp.py
+"""Lazily loaded, NER-only spaCy pipeline."""
+import threading
+
+MODEL = "en_core_web_sm"
+
+# Only tok2vec + ner are needed to find PERSON entities.
+EXCLUDE = ["tagger", "parser", "lemmatizer", "attribute_ruler", "senter"]
+
+# Upper bound on the text handed to NER in the full-text fallback.
+NER_WINDOW_CHARS = 3000
+
+_nlp = None
+_lock = threading.Lock()
+
+
+def get_nlp():
+    """Load the trimmed pipeline on first use and reuse it afterwards."""
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(MODEL, exclude=EXCLUDE)
+    return _nlp
+
+
+def person_entities(text: str) -> list[str]:
+    """PERSON entities found in text, in document order."""
+    doc = get_nlp()(text)
+    return [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
+
+
+def person_entities_batch(texts: list[str], batch_size: int = 64) -> list[list[str]]:
+    """person_entities for many texts in one nlp.pipe pass."""
+    return [
+        [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
+        for doc in get_nlp().pipe(texts, batch_size=batch_size)
+    ]
@@ -0,0 +1,150 @@
+# resume_parser/ocr.py
+"""Optional OCR for pages that have no extractable text (scanned resumes).
+
+Off unless RESUME_OCR=1. Pages are rendered here and recognised by Tesseract
+(pytesseract when installed, else PyMuPDF's built-in OCR) on a small
+dedicated process pool. A page is only submitted when a worker is free (a
+slot is held until the worker is really done with the page), so nothing
+waits in the pool's queue and the timeout only counts recognition time; when
+every worker is busy the page is skipped rather than waited on, so scanned
+uploads cannot hold up text PDFs. A page that overruns its timeout gets the
+pool's workers killed and a fresh pool started, since a hung Tesseract call
+cannot be cancelled. Results are cached by a hash of the page's content
+streams and images.
+"""
+import atexit
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics
+from .metrics import timed
+
+ENABLED = os.environ.get("RESUME_OCR") == "1"
+DPI = int(os.environ.get("RESUME_OCR_DPI", "300"))
+LANGUAGE = os.environ.get("RESUME_OCR_LANG", "eng")
+WORKERS = int(os.environ.get("RESUME_OCR_WORKERS", "1"))
+PAGE_TIMEOUT = float(os.environ.get("RESUME_OCR_TIMEOUT_SECS", "30"))
+CACHE_SIZE = int(os.environ.get("RESUME_OCR_CACHE_SIZE", "256"))
+
+_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_slots = threading.BoundedSemaphore(WORKERS)  # one per worker: a queued page would run out its timer waiting
+_cache: OrderedDict[str, str] = OrderedDict()
+
+
+def recognize_png(png: bytes, language: str = LANGUAGE, timeout: float = PAGE_TIMEOUT) -> str:
+    """Runs in an OCR worker: text of one rendered page."""
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        import fitz
+        pix = fitz.Pixmap(png)
+        with fitz.open("pdf", pix.pdfocr_tobytes(language=language)) as pdf:
+            return pdf[0].get_text("text")
+    # pytesseract kills the tesseract process itself once `timeout` passes.
+    return pytesseract.image_to_string(Image.open(io.BytesIO(png)), lang=language, timeout=timeout)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill a pool's workers (e.g. one stuck on a page) so the next page gets a fresh pool."""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    # The executor has no public way to stop a running task; terminating its processes
+    # fails every pending future with BrokenProcessPool, which releases their slots.
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown() -> None:
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def page_key(page, dpi: int = DPI) -> str:
+    """Hash of what the page draws (content streams and embedded images) and the OCR settings."""
+    h = hashlib.sha256(f"{dpi}:{LANGUAGE}:".encode())
+    h.update(page.read_contents() or b"")
+    for image in page.get_images(full=True):
+        h.update(page.parent.xref_stream_raw(image[0]) or b"")
+    return h.hexdigest()
+
+
+def _remember(key: str, text: str) -> None:
+    with _lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _result(result: str) -> None:
+    metrics.inc("resume_ocr_pages_total", {"result": result})
+
+
+@timed("ocr_page")
+def ocr_page(page, dpi: int = DPI) -> str:
+    """OCR text for a fitz page, or "" when OCR is off, busy, times out or fails."""
+    if not ENABLED:
+        return ""
+    key = page_key(page, dpi)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    if cached is not None:
+        _result("cached")
+        return cached
+    if not _slots.acquire(blocking=False):
+        _result("rejected")
+        return ""
+    pool = None
+    try:
+        import fitz
+        png = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY).tobytes("png")
+        pool = _get_pool()
+        future = pool.submit(recognize_png, png, LANGUAGE, PAGE_TIMEOUT)
+    except Exception:
+        _slots.release()
+        if pool is not None:
+            _reset_pool(pool)  # submit fails once the pool is broken
+        _result("error")
+        return ""
+    # The slot is freed when the worker finishes, not when this caller gives up on it.
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        # The page went straight to an idle worker; the extra seconds cover starting a fresh one.
+        text = future.result(timeout=PAGE_TIMEOUT + 5)
+    except FutureTimeout:
+        _reset_pool(pool)
+        _result("timeout")
+        return ""
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        _result("error")
+        return ""
+    except Exception:
+        _result("error")
+        return ""
+    _remember(key, text)
+    _result("ok")
+    return text
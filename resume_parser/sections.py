@@ -0,0 +1,152 @@
+# resume_parser/sections.py
+"""Split a resume into sections from the heading lines' font size and weight.
+
+The result is a compact index {section: (start, end)} of character ranges
+into the document text, computed once per document. "header" is the text
+before the first section heading (name, contact details).
+"""
+import re
+from collections import Counter
+
+from .metrics import timed
+
+HEADER = "header"
+
+# canonical section -> heading texts that introduce it
+SECTION_ALIASES = {
+    "objective": ("objective", "career objective", "summary", "professional summary", "profile", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship"),
+    "education": ("education", "academic background", "academics", "qualifications"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "skill set", "technologies"),
+    "projects": ("projects", "project", "academic projects", "personal projects"),
+    "achievements": ("achievements", "accomplishments", "awards", "honors", "honours", "awards and achievements"),
+    "hobbies": ("hobbies", "interests", "hobbies and interests", "extracurricular activities"),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+}
+_ALIASES = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+# Span text often lacks the spaces text mode inserts ("SkillsSummary"), so candidates are also keyed without them.
+_COMPACT_ALIASES = {alias.replace(" ", "") for alias in _ALIASES}
+_WORD_RE = re.compile(r"[a-z]+")
+
+MAX_HEADING_WORDS = 5
+MAX_HEADING_CHARS = 40
+HEADING_SIZE_RATIO = 1.08  # a line this much larger than body text reads as a heading (12pt over 10.9pt)
+BOLD_FLAG = 16
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.lower().replace("&", " and ").strip(" :-|•").split())
+
+
+def _short(norm: str) -> bool:
+    return len(norm) <= MAX_HEADING_CHARS and len(_WORD_RE.findall(norm)) <= MAX_HEADING_WORDS
+
+
+def _known(norm: str) -> str | None:
+    return _ALIASES.get(norm) if _short(norm) else None
+
+
+def _compact(line: str) -> str:
+    return "".join(_normalize(line).split())
+
+
+def _lines(page_dicts: list[dict]):
+    """(raw text, max font size, all bold, char count) for every text line."""
+    for page in page_dicts:
+        for block in page.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+            for line in block.get("lines", []):
+                spans = [s for s in line.get("spans", []) if s.get("text", "").strip()]
+                if not spans:
+                    continue
+                raw = "".join(s["text"] for s in spans).strip()
+                size = max(s.get("size", 0) for s in spans)
+                bold = all(s.get("flags", 0) & BOLD_FLAG or "bold" in s.get("font", "").lower() for s in spans)
+                yield raw, size, bold, len(raw)
+
+
+def _build(text: str, found: list[tuple[str, int, int]]) -> dict[str, tuple[int, int]]:
+    """Turn (section, heading start, heading end) positions, in order, into ranges."""
+    # A sub-heading naming the same section ("Skills" then "Technical Skills") continues it.
+    found = [h for i, h in enumerate(found) if i == 0 or h[0] != found[i - 1][0]]
+    if not found:
+        return {}
+    index = {HEADER: (0, found[0][1])}
+    for (name, _, start), nxt in zip(found, found[1:] + [(None, len(text), None)]):
+        index.setdefault(name, (start, nxt[1]))  # a repeated heading keeps its first range
+    return index
+
+
+def _locate(text: str, raw: str, cursor: int) -> tuple[int, int] | None:
+    """(start, end) of a span-dict line in text at or after cursor, ignoring whitespace."""
+    chars = [re.escape(c) for c in raw if not c.isspace()]
+    m = re.compile(r"\s*".join(chars)).search(text, cursor) if chars else None
+    return m.span() if m else None
+
+
+def segment_text(text: str) -> dict[str, tuple[int, int]]:
+    """Text-only segmentation: a line that is exactly a known heading starts a section."""
+    found, pos = [], 0
+    for line in (text or "").splitlines(keepends=True):
+        name = _known(_normalize(line))
+        if name:
+            start = pos + len(line) - len(line.lstrip())
+            found.append((name, start, start + len(line.strip())))
+        pos += len(line)
+    return _build(text or "", found)
+
+
+@timed("sections")
+def segment(page_dicts: list[dict], text: str) -> dict[str, tuple[int, int]]:
+    """Section index for a document from its page span dicts and full text.
+
+    Known heading texts always count. Other lines count when they are short and
+    set larger than the body text (or bold capitals), but only after the first
+    known heading, so the name and contact lines stay in the header. Each
+    candidate is matched to its line in text, whose spacing is used to name it.
+    """
+    lines = list(_lines(page_dicts))
+    sizes = Counter()
+    for _, size, _, chars in lines:
+        sizes[round(size, 1)] += chars
+    if not sizes:
+        return segment_text(text)
+    body = sizes.most_common(1)[0][0]
+
+    found, cursor, seen_known = [], 0, False
+    for raw, size, bold, _ in lines:
+        compact = _compact(raw)
+        if not compact or len(compact) > MAX_HEADING_CHARS:
+            continue
+        styled = size >= body * HEADING_SIZE_RATIO or (bold and raw.isupper())
+        if not styled and compact not in _COMPACT_ALIASES:
+            continue
+        span = _locate(text, raw, cursor)
+        if span is None:
+            continue
+        cursor = span[1]
+        norm = _normalize(text[span[0]:span[1]])
+        if not _short(norm):
+            continue
+        name = _known(norm)
+        if name is None and styled:
+            # "Work Experience & Internships" -> experience; otherwise keep the heading's own text
+            name = next((_ALIASES[w] for w in _WORD_RE.findall(norm) if w in _ALIASES), None)
+            if name is None and seen_known:
+                name = norm
+        if name is None:
+            continue
+        seen_known = seen_known or name in SECTION_ALIASES
+        found.append((name, *span))
+    return _build(text, found) or segment_text(text)
+
+
+def section_text(text: str, sections: dict, name: str) -> str | None:
+    """The slice of text for one section, or None when the resume has no such section."""
+    span = (sections or {}).get(name)
+    if span is None:
+        return None
+    start, end = span
+    return text[start:end]
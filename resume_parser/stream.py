@@ -0,0 +1,111 @@
+# resume_parser/stream.py
+"""Page-by-page parsing that stops as soon as the requested fields are settled.
+
+parse_resume always reads the whole document (up to the caps) because
+scoring and field prediction need all of it. When a caller only needs some
+fields, e.g. name and contact details, stream_resume feeds one page at a
+time to the extractors and stops reading once every requested field is
+resolved, which for most resumes is after page one.
+"""
+from .document import PdfDocument
+from .extract import (
+    NAME_NOT_FOUND,
+    PHONE_REGIONS,
+    contacts_from_uris,
+    extract_first_lines,
+    extract_name_by_font,
+    extract_name_by_ner,
+    extract_skills,
+    find_emails,
+    find_phones,
+    find_profiles,
+)
+from .metrics import timed
+from .nlp import NER_WINDOW_CHARS
+from .sections import HEADER, section_text, segment
+
+STREAM_FIELDS = ("name", "email", "mobile_number")
+CONTACT_FIELDS = {"email", "mobile_number", "profiles"}
+SUPPORTED_FIELDS = {"name", "skills"} | CONTACT_FIELDS
+
+
+def _first_page_name(doc: PdfDocument) -> str | None:
+    try:
+        return extract_name_by_font(doc) or extract_name_by_ner(extract_first_lines(doc, n_lines=10))
+    except Exception:
+        return None
+
+
+def _skills_state(state: str | None, page_dict: dict, page_text: str) -> str | None:
+    """None (no Skills heading yet) -> "open" -> "closed" once a later heading ends the section."""
+    headings = [name for name in segment([page_dict], page_text) if name != HEADER]
+    if state == "open" and headings and headings[0] != "skills":
+        return "closed"
+    if "skills" in headings:
+        return "closed" if headings[-1] != "skills" else "open"
+    return state
+
+
+@timed("parse_streaming")
+def stream_resume(source, fields=STREAM_FIELDS, max_pages: int | None = None, max_chars: int | None = None,
+                  regions: list[str] | None = None) -> dict:
+    """Parse only `fields`, reading pages until they are all resolved (or the caps are hit)."""
+    wanted = set(fields)
+    unknown = wanted - SUPPORTED_FIELDS
+    if unknown:
+        raise ValueError(f"unsupported fields: {sorted(unknown)}")
+    regions = regions or PHONE_REGIONS
+
+    with PdfDocument(source, max_pages=max_pages, max_chars=max_chars) as doc:
+        name, name_done, skills_state = None, "name" not in wanted, None
+        emails, phones, profiles = [], [], []
+        texts, dicts, chars = [], [], 0
+        for i, page_text in doc.iter_pages():
+            texts.append(page_text)
+            chars += len(page_text)
+            page_emails, page_phones, page_profiles = (
+                contacts_from_uris(doc.page_links(i), regions) if wanted & CONTACT_FIELDS else ([], [], []))
+            if i == 0 and not name_done:
+                name = _first_page_name(doc)
+                name_done = name is not None
+            if "email" in wanted and not emails:
+                emails = page_emails + find_emails(page_text)
+            if "mobile_number" in wanted and not phones:
+                phones = page_phones + find_phones(page_text, regions)
+            if "profiles" in wanted and not profiles:
+                profiles = page_profiles + find_profiles(page_text)
+            if "skills" in wanted:
+                dicts.append(doc.page_dict(i))
+                skills_state = _skills_state(skills_state, dicts[-1], page_text)
+
+            if not name_done and chars >= NER_WINDOW_CHARS:
+                name = extract_name_by_ner("".join(texts)[:NER_WINDOW_CHARS])
+                name_done = True
+            resolved = {
+                "name": name_done,
+                "email": bool(emails),
+                "mobile_number": bool(phones),
+                "profiles": bool(profiles),
+                "skills": skills_state == "closed",
+            }
+            if all(resolved[f] for f in wanted):
+                break
+
+        text = "".join(texts).strip()
+        result = {"no_of_pages": doc.page_count, "pages_read": len(texts), "text": text}
+        if "name" in wanted:
+            if not name_done:
+                name = extract_name_by_ner(text[:NER_WINDOW_CHARS])
+            result["name"] = name or NAME_NOT_FOUND
+        if "email" in wanted:
+            result["email"] = emails[0] if emails else None
+            result["emails"] = list(dict.fromkeys(emails))
+        if "mobile_number" in wanted:
+            result["mobile_number"] = phones[0] if phones else None
+            result["phones"] = list(dict.fromkeys(phones))
+        if "profiles" in wanted:
+            result["profiles"] = list(dict.fromkeys(profiles))
+        if "skills" in wanted:
+            # Same layout-based sections as parse_resume, over the pages read.
+            result["skills"] = extract_skills(section_text(text, segment(dicts, text), "skills") or text)
+        return result
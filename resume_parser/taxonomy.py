@@ -0,0 +1,123 @@
+# resume_parser/taxonomy.py
+"""Skill/field taxonomy loaded from a JSON data file.
+
+The file (taxonomy.json next to this module, or $RESUME_TAXONOMY) is only
+re-read when its mtime or size changes, so the compiled matcher survives
+Streamlit reruns and a new taxonomy can be dropped in without a redeploy.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+
+from .matcher import FIELD, SKILL, KeywordMatcher
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomy.json")
+
+
+class Taxonomy:
+    """Indexed view of one taxonomy file."""
+
+    def __init__(self, data: dict, previous: "Taxonomy | None" = None):
+        self.version = data.get("version")
+        # Changes with any edit to the data, so results derived from an older taxonomy can be told apart.
+        self.fingerprint = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+        self.skills: list[str] = []
+        # term (lowercase) -> [(kind, label)]; aliases map to their canonical skill
+        self.term_index: dict[str, list[tuple[str, str]]] = {}
+        for entry in data.get("skills", []):
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            name = entry["name"]
+            self.skills.append(name)
+            for term in [name, *entry.get("aliases", [])]:
+                self._index(term, (SKILL, name))
+
+        # fields keep file order: predict_field breaks ties by it
+        self.fields: list[str] = []
+        self.recommended_skills: dict[str, list[str]] = {}
+        self.courses: dict[str, list[list[str]]] = {}
+        for entry in data.get("fields", []):
+            name = entry["name"]
+            self.fields.append(name)
+            for term in entry.get("keywords", []):
+                self._index(term, (FIELD, name))
+            self.recommended_skills[name] = list(entry.get("recommended_skills", []))
+            self.courses[name] = [[c["name"], c["link"]] for c in entry.get("courses", [])]
+
+        self.matcher = self._build_matcher(previous)
+
+    def _index(self, term: str, tag: tuple[str, str]) -> None:
+        tags = self.term_index.setdefault(" ".join(term.lower().split()), [])
+        if tag not in tags:
+            tags.append(tag)
+
+    def _build_matcher(self, previous: "Taxonomy | None") -> KeywordMatcher:
+        if previous is not None:
+            if previous.term_index == self.term_index:
+                return previous.matcher
+            if previous.term_index.keys() == self.term_index.keys():
+                # Same terms, different tags: keep the compiled regex.
+                return KeywordMatcher(self.term_index, pattern=previous.matcher.pattern)
+        return KeywordMatcher(self.term_index)
+
+    def lookup(self, term: str) -> list[tuple[str, str]]:
+        """(kind, label) tags for a term or alias."""
+        return self.term_index.get(" ".join(term.lower().split()), [])
+
+
+_lock = threading.Lock()
+_current: Taxonomy | None = None
+_stamp = None
+
+
+def taxonomy_path() -> str:
+    return os.environ.get("RESUME_TAXONOMY") or DEFAULT_PATH
+
+
+def get_taxonomy() -> Taxonomy:
+    """Return the current taxonomy, reloading it if the file changed on disk."""
+    global _current, _stamp
+    path = taxonomy_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        if _current is not None:
+            return _current
+        raise
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    if stamp != _stamp:
+        with _lock:
+            if stamp != _stamp:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                except ValueError:
+                    # Half-written or broken file: keep serving the last good taxonomy.
+                    if _current is not None:
+                        return _current
+                    raise
+                _current = Taxonomy(data, previous=_current)
+                _stamp = stamp
+    return _current
+
+
+@lru_cache(maxsize=64)
+def _scan(matcher: KeywordMatcher, text: str) -> Counter:
+    return matcher.hits(text)
+
+
+def scan(text: str) -> Counter:
+    """Matcher hits for text, memoized so extraction and analysis share one pass. Do not mutate."""
+    return _scan(get_taxonomy().matcher, text or "")
+
+
+def skills_in(text: str) -> list[str]:
+    return sorted(label for kind, label in scan(text) if kind == SKILL)
+
+
+def field_counts(text: str) -> dict[str, int]:
+    """Keyword hit count per field."""
+    return {label: n for (kind, label), n in scan(text).items() if kind == FIELD}
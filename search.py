@@ -0,0 +1,263 @@
+# search.py
+"""Candidate search over parsed resumes, backed by a local SQLite FTS5 index.
+
+Rows are indexed as they are stored, so a query never has to pull the whole
+user_data table. A query mixes boolean full-text terms with filters:
+
+    python AND (aws OR azure) NOT php, level:intermediate, score >= 60
+    skill:"machine learning" field:"data science"
+
+Bare words match the resume text; a word that names a known skill also
+matches that skill. Operators must be uppercase (a lowercase "and" is just a
+word). A leading NOT excludes terms from everything else the query matches,
+e.g. "NOT php, score >= 60". Results are ranked by BM25 (tags weigh most), or
+by score when the query has no text terms. To index rows stored before the index
+existed (tags only, their text was never kept):
+
+    python search.py backfill
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from resume_parser import get_taxonomy, metrics
+from resume_parser.matcher import SKILL
+
+LEVELS = ("Fresher", "Intermediate", "Experienced")
+
+# bm25 column weights for (name, tags, text)
+RANK_WEIGHTS = (2.0, 5.0, 1.0)
+
+_TOKEN_RE = re.compile(r'''
+    (?P<score>(?i:\bscore\s*(?:>=|<=|>|<|=)\s*\d+))
+  | (?P<tag>(?i:\b(?:skill|field|level):)(?:"[^"]*"|[^\s,()"]+))
+  | (?P<op>\b(?:AND|OR|NOT)\b|[()])
+  | (?P<phrase>"[^"]*")
+  | (?P<word>[^\s,()"]+)
+''', re.X)
+_SCORE_RE = re.compile(r"score\s*(>=|<=|>|<|=)\s*(\d+)", re.I)
+
+
+def tag(prefix: str, value: str) -> str:
+    """Single index token for a skill/field/level value, e.g. ("sk", "Node.js") -> "sk_node_js"."""
+    value = value.lower().replace("+", "plus").replace("#", "sharp")
+    return prefix + "_" + "_".join(re.findall(r"[0-9a-z]+", value))
+
+
+def _canonical_skill(term: str) -> str | None:
+    for kind, label in get_taxonomy().lookup(term):
+        if kind == SKILL:
+            return label
+    return None
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+_OPERATORS = ("AND", "OR", "NOT")
+
+
+def _operand(expr: list[str], i: int) -> int:
+    """Index just past the operand (a term or a parenthesised group) starting at expr[i]."""
+    if i >= len(expr) or expr[i] in _OPERATORS or expr[i] == ")":
+        raise ValueError("invalid search query: NOT must be followed by a term")
+    if expr[i] != "(":
+        return i + 1
+    depth = 0
+    for j in range(i, len(expr)):
+        depth += {"(": 1, ")": -1}.get(expr[j], 0)
+        if depth == 0:
+            return j + 1
+    raise ValueError("invalid search query: unbalanced parentheses")
+
+
+def parse_query(query: str) -> tuple[str, str, list[tuple[str, int]]]:
+    """Split a search string into FTS5 MATCH and exclusion expressions and [(operator, score)] filters.
+
+    The exclusion expression comes from a leading NOT, which FTS5 cannot express
+    on its own; either expression may be empty.
+    """
+    parts, scores = [], []
+    for m in _TOKEN_RE.finditer(query or ""):
+        kind, text = m.lastgroup, m.group()
+        if kind == "score":
+            op, n = _SCORE_RE.match(text).groups()
+            scores.append((op, int(n)))
+        elif kind == "tag":
+            key, _, value = text.partition(":")
+            value = value.strip('"')
+            key = key.lower()
+            if key == "skill":
+                parts.append("tags : " + _quote(tag("sk", _canonical_skill(value) or value)))
+            else:
+                parts.append("tags : " + _quote(tag("fd" if key == "field" else "lv", value)))
+        elif kind == "op":
+            parts.append(text)
+        elif kind == "phrase":
+            parts.append(_quote(text.strip('"')))
+        else:
+            if text.capitalize() in LEVELS:
+                parts.append("tags : " + _quote(tag("lv", text)))
+                continue
+            skill = _canonical_skill(text)
+            if skill:
+                parts.append(f"({_quote(text)} OR tags : {_quote(tag('sk', skill))})")
+            else:
+                parts.append(_quote(text))
+    # FTS5 only allows implicit AND between plain phrases, so spell it out between operands.
+    # NOT is binary in FTS5, so "a AND NOT b" becomes "a NOT b".
+    expr = []
+    for part in parts:
+        if part == "NOT" and expr and expr[-1] == "AND":
+            expr.pop()
+        if expr and expr[-1] not in ("AND", "OR", "NOT", "(") and part not in ("AND", "OR", "NOT", ")"):
+            expr.append("AND")
+        expr.append(part)
+
+    # Leading "NOT a [NOT b ...]" terms exclude rows from whatever the rest matches (or from all rows).
+    excluded = []
+    while expr and expr[0] == "NOT":
+        end = _operand(expr, 1)
+        excluded.append(" ".join(expr[1:end]))
+        expr = expr[end:]
+        if expr and expr[0] == "AND":
+            expr = expr[1:]
+        elif expr and expr[0] != "NOT":
+            raise ValueError(f"invalid search query: {expr[0]} cannot follow a leading NOT term")
+    for prev, part in zip(["("] + expr, expr):
+        if part == "NOT" and prev in ("(", "AND", "OR", "NOT"):
+            raise ValueError("invalid search query: NOT needs a term before it, e.g. python NOT php")
+    return " ".join(expr), " OR ".join(excluded), scores
+
+
+class CandidateIndex:
+    """Full-text and tag index of stored resumes, keyed by upload content hash."""
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL keeps per-row commits cheap and lets searches run while rows are being added.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                resume_key TEXT NOT NULL UNIQUE,
+                name TEXT, email TEXT, field TEXT, level TEXT,
+                score INTEGER, ts TEXT, skills TEXT
+            );
+            CREATE INDEX IF NOT EXISTS candidates_score ON candidates (score);
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts
+                USING fts5(name, tags, text, tokenize="unicode61 tokenchars '_'");
+        """)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def add(self, resume_key: str, name: str, email: str, skills: list[str], field: str, level: str,
+            score: int, timestamp: str, text: str = "", commit: bool = True) -> None:
+        """Index (or re-index) one resume."""
+        tags = [tag("sk", s) for s in skills or []]
+        if field:
+            tags.append(tag("fd", field))
+        if level:
+            tags.append(tag("lv", level))
+        with self._lock:
+            row = self._db.execute("SELECT id FROM candidates WHERE resume_key = ?", (resume_key,)).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM candidate_fts WHERE rowid = ?", row)
+                self._db.execute("DELETE FROM candidates WHERE id = ?", row)
+            cur = self._db.execute(
+                "INSERT INTO candidates (resume_key, name, email, field, level, score, ts, skills) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (resume_key, name, email, field, level, int(score or 0), timestamp, json.dumps(list(skills or []))),
+            )
+            self._db.execute("INSERT INTO candidate_fts (rowid, name, tags, text) VALUES (?, ?, ?, ?)",
+                             (cur.lastrowid, name or "", " ".join(tags), text or ""))
+            if commit:
+                self._db.commit()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._db.commit()
+
+    @metrics.timed("search")
+    def search(self, query: str, limit: int = 50, offset: int = 0) -> list[dict]:
+        """Candidates matching the query, best first."""
+        match, exclude, scores = parse_query(query)
+        conds, params = [], []
+        if exclude:
+            conds.append("c.id NOT IN (SELECT rowid FROM candidate_fts WHERE candidate_fts MATCH ?)")
+            params.append(exclude)
+        for op, n in scores:
+            conds.append(f"c.score {'=' if op == '=' else op} ?")
+            params.append(n)
+        cols = "c.resume_key, c.name, c.email, c.field, c.level, c.score, c.ts, c.skills"
+        if match:
+            where = " AND ".join(["candidate_fts MATCH ?"] + conds)
+            sql = (f"SELECT {cols}, bm25(candidate_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS rank "
+                   f"FROM candidate_fts JOIN candidates c ON c.id = candidate_fts.rowid "
+                   f"WHERE {where} ORDER BY rank LIMIT ? OFFSET ?")
+            params = [match] + params
+        else:
+            where = (" WHERE " + " AND ".join(conds)) if conds else ""
+            sql = f"SELECT {cols}, 0 AS rank FROM candidates c{where} ORDER BY c.score DESC, c.id DESC LIMIT ? OFFSET ?"
+        try:
+            with self._lock:
+                rows = self._db.execute(sql, params + [int(limit), int(offset)]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"invalid search query: {e}") from None
+        keys = ("resume_key", "name", "email", "field", "level", "score", "timestamp", "skills", "rank")
+        results = [dict(zip(keys, row)) for row in rows]
+        for r in results:
+            r["skills"] = json.loads(r["skills"] or "[]")
+        return results
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def backfill(index: CandidateIndex, connection, batch: int = 1000) -> int:
+    """Index every user_data row (tags and name only); returns rows indexed."""
+    import db
+
+    sql = (f"SELECT ID, Resume_key, Name, email, Actual_skills, Predicted_Field, User_level, resume_score, "
+           f"Timestamp FROM {db.DB_TABLE_NAME} ORDER BY ID")
+    count = 0
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql)
+        for row_id, key, name, email, skills, field, level, score, ts in cursor:
+            index.add(key or f"row-{row_id}", name, email, db.skill_list(skills), field, level, score,
+                      str(ts) if ts else None, commit=False)
+            count += 1
+            if count % batch == 0:
+                index.commit()
+    index.commit()
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    ap = argparse.ArgumentParser(description="Candidate search index")
+    ap.add_argument("command", choices=["backfill", "query"])
+    ap.add_argument("query", nargs="?", default="")
+    ap.add_argument("--index", default=os.environ.get("RESUME_SEARCH_DB") or "candidate_index.db")
+    ap.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+    index = CandidateIndex(args.index)
+    if args.command == "backfill":
+        import db
+        with closing(db.connect()) as conn:
+            print(f"{backfill(index, conn)} rows indexed into {args.index}")
+    else:
+        start = time.perf_counter()
+        for r in index.search(args.query, limit=args.limit):
+            print(f"{r['score']:>3}  {r['level'] or '-':<12} {r['field'] or '-':<22} {r['name']}  {', '.join(r['skills'])}")
+        print(f"({(time.perf_counter() - start) * 1000:.1f} ms)")
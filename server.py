@@ -0,0 +1,240 @@
+# server.py
+"""Async HTTP API for resume parsing, built on the headless resume_parser package.
+
+    uvicorn server:app --host 0.0.0.0 --port 8000
+
+POST /parse with the PDF either as a multipart "file" field or as a raw
+application/pdf body. Parsing runs on a bounded process pool; once
+RESUME_API_MAX_INFLIGHT requests are queued or running, new ones get a 503
+with Retry-After instead of piling up, so a load balancer can move them on.
+A job is only handed to the pool once a worker is free, so the timeout counts
+parsing time, not queueing. A job that overruns it, or a worker that dies
+(OOM kill, a crash on a hostile PDF), gets the pool replaced by a fresh one.
+With ?fields=name,email,mobile_number only those fields are returned, and
+only as many pages are read as it takes to find them.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from resume_parser import metrics
+
+WORKERS = int(os.environ.get("RESUME_API_WORKERS", str(os.cpu_count() or 1)))
+MAX_INFLIGHT = int(os.environ.get("RESUME_API_MAX_INFLIGHT", str(WORKERS * 4)))
+MAX_UPLOAD_BYTES = int(os.environ.get("RESUME_API_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+PARSE_TIMEOUT = float(os.environ.get("RESUME_API_TIMEOUT_SECS", "60"))
+
+
+class DocumentError(Exception):
+    """The upload is not a PDF the parser can read (answered with a 422)."""
+
+
+def _init_worker() -> None:
+    from resume_parser import get_nlp
+    get_nlp()
+
+
+def parse_job(data: bytes, include_text: bool, n_courses: int) -> tuple[dict, list]:
+    """Runs in a worker process: parse, analyze and recommend for one upload.
+
+    Returns the response body and the metric events recorded while doing it.
+    """
+    import fitz
+
+    from resume_parser import analyze_resume, parse_resume, recommend_courses
+
+    with metrics.capture() as events:
+        try:
+            resume = parse_resume(data)
+        except fitz.FileDataError as e:
+            raise DocumentError(str(e)) from None
+        analysis = analyze_resume(resume)
+    analysis["recommended_courses"] = recommend_courses(analysis["reco_field"], n_courses)
+    if not include_text:
+        resume.pop("text", None)
+    return {"resume": resume, "analysis": analysis}, events
+
+
+def stream_job(data: bytes, fields: list[str]) -> tuple[dict, list]:
+    """Runs in a worker process: only the requested fields, stopping at the first page that settles them."""
+    import fitz
+
+    from resume_parser import stream_resume
+
+    with metrics.capture() as events:
+        try:
+            resume = stream_resume(data, fields)
+        except (fitz.FileDataError, ValueError) as e:
+            raise DocumentError(str(e)) from None
+    resume.pop("text", None)
+    return {"resume": resume}, events
+
+
+class Backpressure:
+    """Admit at most `limit` requests at once; the rest are rejected immediately."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.inflight = 0
+
+    def try_acquire(self) -> bool:
+        # Single event loop thread: no lock needed.
+        if self.inflight >= self.limit:
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self) -> None:
+        self.inflight -= 1
+
+
+_pool: ProcessPoolExecutor | None = None
+_workers: asyncio.Semaphore | None = None
+_gate = Backpressure(MAX_INFLIGHT)
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=WORKERS, initializer=_init_worker,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    """Swap in a fresh pool and kill the old one's workers (one of them hung or died)."""
+    global _pool
+    if _pool is pool:
+        _pool = _new_pool()
+    # The executor has no public way to stop a running job; terminating its processes
+    # fails every job still on it with BrokenProcessPool, which frees their worker slots.
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _job_done(job: asyncio.Future) -> None:
+    _workers.release()
+    if not job.cancelled():
+        job.exception()  # retrieved, even when its request stopped waiting
+
+
+async def _submit(fn, *args) -> tuple[ProcessPoolExecutor, asyncio.Future]:
+    """Start fn on the pool once a worker is free; the worker slot is held until the job is over."""
+    await _workers.acquire()
+    pool = _pool
+    try:
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died while idle: start this job on a fresh pool instead.
+            _reset_pool(pool)
+            pool = _pool
+            future = pool.submit(fn, *args)
+    except BaseException:
+        _workers.release()
+        raise
+    job = asyncio.wrap_future(future)
+    job.add_done_callback(_job_done)
+    return pool, job
+
+
+def _failed(status: int, error: str, headers: dict | None = None) -> JSONResponse:
+    metrics.inc("resume_api_requests_total", {"status": str(status)})
+    return JSONResponse({"error": error}, status_code=status, headers=headers)
+
+
+async def _read_upload(request) -> bytes:
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            return b""
+        return await upload.read(MAX_UPLOAD_BYTES + 1)
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            break
+    return b"".join(chunks)
+
+
+async def parse(request):
+    if not _gate.try_acquire():
+        return _failed(503, "busy", {"Retry-After": "1"})
+    job = None
+    try:
+        courses = request.query_params.get("courses", "5")
+        if not (courses.isascii() and courses.isdigit()):
+            return JSONResponse({"error": "courses must be a non-negative integer"}, status_code=400)
+        n_courses = int(courses)
+        data = await _read_upload(request)
+        if not data:
+            return JSONResponse({"error": "no PDF in request"}, status_code=400)
+        if len(data) > MAX_UPLOAD_BYTES:
+            return JSONResponse({"error": "upload too large"}, status_code=413)
+        include_text = request.query_params.get("include_text") in ("1", "true")
+        fields = [f for f in request.query_params.get("fields", "").split(",") if f]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            if fields:
+                pool, job = await _submit(stream_job, data, fields)
+            else:
+                pool, job = await _submit(parse_job, data, include_text, n_courses)
+            # From here the gate slot is freed when the job ends, even if this request stops waiting first.
+            job.add_done_callback(lambda _: _gate.release())
+            result, events = await asyncio.wait_for(asyncio.shield(job), PARSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            _reset_pool(pool)  # the hung job keeps its worker until the worker is killed
+            return _failed(504, "parse timed out")
+        except DocumentError as e:
+            return _failed(422, str(e))
+        except BrokenProcessPool:
+            if job is not None:
+                _reset_pool(pool)
+            return _failed(503, "parser restarting", {"Retry-After": "1"})
+        except Exception as e:
+            return _failed(500, f"{type(e).__name__}: {e}")
+        metrics.replay(events)
+        metrics.inc("resume_api_requests_total", {"status": "200"})
+        metrics.log_trace(request.headers.get("x-request-id", ""), events, loop.time() - start, bytes=len(data))
+        return JSONResponse(result)
+    finally:
+        if job is None:
+            _gate.release()
+
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def health(request):
+    return JSONResponse({"status": "ok", "inflight": _gate.inflight, "max_inflight": _gate.limit})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global _pool, _workers
+    _pool = _new_pool()
+    _workers = asyncio.Semaphore(WORKERS)
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+app = Starlette(
+    routes=[
+        Route("/parse", parse, methods=["POST"]),
+        Route("/health", health, methods=["GET"]),
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,28 @@
+import os
+import signal
+import time
+
+import pytest
+
+import batch
+from conftest import SAMPLE_DIR
+
+PATHS = [os.path.join(SAMPLE_DIR, f) for f in ("My_resume (5).pdf", "new_resume (10).pdf")]
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGALRM"), reason="timeouts need SIGALRM")
+def test_hung_file_fails_alone_within_its_own_timeout(monkeypatch):
+    load = batch._load
+
+    def slow_load(path):
+        if path == PATHS[0]:
+            time.sleep(30)
+        return load(path)
+
+    monkeypatch.setattr(batch, "_timeout", 1)
+    monkeypatch.setattr(batch, "_load", slow_load)
+    started = time.monotonic()
+    rows = batch.parse_chunk(PATHS)
+    assert time.monotonic() - started < 10
+    assert rows[0]["path"] == PATHS[0] and rows[0]["error"].startswith("TimeoutError")
+    assert rows[1]["path"] == PATHS[1] and rows[1]["error"] == "" and rows[1]["name"]
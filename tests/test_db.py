@@ -0,0 +1,144 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import db
+
+
+def _count(factory) -> int:
+    with closing(factory()) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {db.DB_TABLE_NAME}").fetchone()[0]
+
+
+def test_insert_queue_drains_after_database_outage(tmp_path, monkeypatch):
+    path = str(tmp_path / "users.db")
+
+    def factory():
+        return sqlite3.connect(path, check_same_thread=False)
+
+    with closing(factory()) as conn:
+        db.create_table(conn)
+
+    down = threading.Event()
+    down.set()
+    insert_many = db.insert_many
+
+    def flaky_insert(conn, rows):
+        if down.is_set():
+            raise sqlite3.OperationalError("database is down")
+        insert_many(conn, rows)
+
+    monkeypatch.setattr(db, "insert_many", flaky_insert)
+    inserts = db.InsertQueue(db.ConnectionPool(factory, size=2), batch_size=2, flush_interval=0.05, max_pending=4,
+                             put_timeout=10, dead_letter_path=str(tmp_path / "rejected.jsonl"))
+    rows = [db.make_row(f"user {i}", "", 40, db.make_timestamp(), 1, "", "", "[]", "[]", "[]") for i in range(12)]
+    producer = threading.Thread(target=lambda: [inserts.put(r) for r in rows], daemon=True)
+    producer.start()
+
+    time.sleep(0.5)  # the writer fails repeatedly while the producer fills the queue
+    assert producer.is_alive(), "a full queue should block the producer"
+    assert _count(factory) == 0
+
+    down.clear()
+    producer.join(timeout=5)
+    assert not producer.is_alive(), "producer still blocked after the database recovered"
+    deadline = time.monotonic() + 5
+    while _count(factory) < len(rows) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    inserts.close()
+    assert _count(factory) == len(rows)
+    assert inserts.pending() == 0
+
+
+
+def test_insert_queue_dead_letters_a_row_the_database_rejects(tmp_path, monkeypatch):
+    path = str(tmp_path / "users.db")
+    dead_letter = tmp_path / "rejected.jsonl"
+
+    def factory():
+        return sqlite3.connect(path, check_same_thread=False)
+
+    with closing(factory()) as conn:
+        db.create_table(conn)
+    insert_many = db.insert_many
+
+    def strict_insert(conn, rows):
+        if any(row[0] == "bad" for row in rows):
+            raise sqlite3.DataError("Incorrect string value")
+        insert_many(conn, rows)
+
+    monkeypatch.setattr(db, "insert_many", strict_insert)
+    inserts = db.InsertQueue(db.ConnectionPool(factory, size=2), batch_size=3, flush_interval=60,
+                             max_attempts=2, dead_letter_path=str(dead_letter))
+    try:
+        inserts.put(db.make_row("bad", "", 40, db.make_timestamp(), 1, "", "", "[]", "[]", "[]"))
+        for i in range(4):
+            inserts.put(db.make_row(f"user {i}", "", 40, db.make_timestamp(), 1, "", "", "[]", "[]", "[]"))
+        assert inserts.flush() == 4  # the bad row no longer holds up the rows behind it
+        assert inserts.pending() == 1 and not dead_letter.exists()
+        inserts.put(db.make_row("user 4", "", 40, db.make_timestamp(), 1, "", "", "[]", "[]", "[]"))
+        assert inserts.flush() == 1
+        assert inserts.pending() == 0
+        assert _count(factory) == 5
+        rejected = [json.loads(line) for line in dead_letter.read_text().splitlines()]
+        assert [r["row"][0] for r in rejected] == ["bad"]
+        assert rejected[0]["error"].startswith("DataError")
+    finally:
+        inserts.close()
+
+
+def test_insert_queue_put_times_out_when_full(tmp_path):
+    inserts = db.InsertQueue(db.ConnectionPool(lambda: sqlite3.connect(str(tmp_path / "users.db"))),
+                             flush_interval=60, max_pending=1, put_timeout=0.1)
+    inserts._stop.set()  # no writer draining the queue
+    inserts.put(("row",))
+    started = time.monotonic()
+    try:
+        inserts.put(("row",))
+        raise AssertionError("put should not wait forever")
+    except queue.Full:
+        assert time.monotonic() - started < 2
+
+
+NO_FILTERS = dict(date_from=None, date_to=None, field=None, level=None, min_score=None, max_score=None,
+                  collapse_duplicates=False)
+
+
+def _rollup_db():
+    conn = sqlite3.connect(":memory:")
+    db.create_table(conn)
+    db.insert_many(conn, [
+        db.make_row("a", "", 40, "2024-01-02 10:00:00", 1, "Web Development", "Fresher", str(["Java", "AWS"]), "[]", "[]"),
+        db.make_row("b", "", 60, "2024-01-03 10:00:00", 1, "Data Science", "Fresher", str(["Python"]), "[]", "[]"),
+    ])
+    return conn
+
+
+def test_summary_stats_apply_score_filter_to_top_skills():
+    with closing(_rollup_db()) as conn:
+        stats = db.summary_stats(conn, {**NO_FILTERS, "min_score": 50})
+        assert stats["total"] == 1
+        assert stats["top_skills"] == [("Python", 1)]
+        stats = db.summary_stats(conn, {**NO_FILTERS, "min_score": 80})
+        assert stats["total"] == 0
+        assert stats["top_skills"] == []
+
+
+def test_rebuilt_rollups_match_incremental_ones():
+    with closing(_rollup_db()) as conn:
+        before = db.summary_stats(conn, NO_FILTERS)
+        assert db.rebuild_rollups(conn) == 2
+        assert db.summary_stats(conn, NO_FILTERS) == before
+
+
+def test_create_table_upgrades_skills_rollup_without_scores():
+    with closing(_rollup_db()) as conn:
+        conn.execute(f"DROP TABLE {db.SKILLS_TABLE}")
+        conn.execute(f"CREATE TABLE {db.SKILLS_TABLE} (Day VARCHAR(10), Predicted_Field VARCHAR(255), "
+                     "User_level VARCHAR(100), Skill VARCHAR(100), Count INT, "
+                     "PRIMARY KEY (Day, Predicted_Field, User_level, Skill))")
+        db.create_table(conn)
+        assert db.summary_stats(conn, {**NO_FILTERS, "max_score": 50})["top_skills"] == [("AWS", 1), ("Java", 1)]
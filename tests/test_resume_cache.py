@@ -0,0 +1,35 @@
+from resume_cache import ResumeCache
+
+
+def test_entries_from_another_version_are_misses(tmp_path):
+    version = ["1:aaaa"]
+    path = str(tmp_path / "cache.db")
+    cache = ResumeCache(db_path=path, version=lambda: version[0])
+    cache.put("k", {"skills": ["Java"]})
+    assert cache.get("k") == {"skills": ["Java"]}
+
+    version[0] = "1:bbbb"  # e.g. the taxonomy was edited
+    assert cache.get("k") is None
+    assert ResumeCache(db_path=path, version=lambda: version[0]).get("k") is None
+
+    calls = []
+    assert cache.get_or_parse(b"pdf", lambda: calls.append(1) or {"skills": ["Python"]}, key="k") == {"skills": ["Python"]}
+    assert calls == [1]
+    assert ResumeCache(db_path=path, version=lambda: version[0]).get("k") == {"skills": ["Python"]}
+
+
+def test_default_version_follows_the_taxonomy():
+    from resume_parser import PARSER_VERSION, cache_version
+
+    assert cache_version().startswith(PARSER_VERSION + ":")
+
+
+def test_unrecorded_lookups_leave_stats_alone(tmp_path):
+    cache = ResumeCache(db_path=str(tmp_path / "cache.db"), version=lambda: "1")
+    cache.put("k", {"name": "A"})
+    assert cache.get("k", record=False) == {"name": "A"}
+    assert cache.get("missing", record=False) is None
+    assert ResumeCache(db_path=str(tmp_path / "cache.db"), version=lambda: "1").get("k", record=False) == {"name": "A"}
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.get("k")
+    assert (cache.hits, cache.misses) == (1, 0)
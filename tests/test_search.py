@@ -0,0 +1,56 @@
+import pytest
+
+from search import CandidateIndex, parse_query
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = CandidateIndex(str(tmp_path / "index.db"))
+    idx.add("a", "Asha", "a@x.com", ["Java", "SQL"], "Web Development", "Fresher", 40, "2024-01-01",
+            text="java developer with sql and spring")
+    idx.add("b", "Bela", "b@x.com", ["Python"], "Data Science", "Intermediate", 80, "2024-01-02",
+            text="python pandas research or analysis")
+    idx.add("c", "Chen", "c@x.com", ["PHP"], "Web Development", "Fresher", 60, "2024-01-03",
+            text="php laravel not java")
+    yield idx
+    idx.close()
+
+
+def _names(results):
+    return sorted(r["name"] for r in results)
+
+
+def test_lowercase_operators_are_plain_words():
+    match, exclude, _ = parse_query("research or analysis not laravel")
+    assert match == '"research" AND "or" AND "analysis" AND "not" AND "laravel"'
+    assert exclude == ""
+
+
+def test_lowercase_words_match_text(index):
+    assert _names(index.search("research or analysis")) == ["Bela"]
+
+
+def test_uppercase_operators_still_work(index):
+    assert _names(index.search("java OR python")) == ["Asha", "Bela", "Chen"]
+    assert _names(index.search("java NOT php")) == ["Asha"]
+
+
+def test_leading_not_excludes_from_all_rows(index):
+    assert _names(index.search("NOT java")) == ["Bela"]
+    assert _names(index.search("NOT java NOT python")) == []
+    assert _names(index.search("NOT php, score >= 50")) == ["Bela"]
+
+
+def test_leading_not_with_positive_terms(index):
+    assert _names(index.search("NOT php, java")) == ["Asha"]
+    assert _names(index.search("NOT (php OR python)")) == ["Asha"]
+
+
+def test_and_not_is_rewritten(index):
+    assert _names(index.search("java AND NOT php")) == ["Asha"]
+
+
+@pytest.mark.parametrize("query", ["java OR NOT php", "(NOT java)", "NOT", "NOT php OR java"])
+def test_unsupported_not_is_rejected_with_a_clear_message(index, query):
+    with pytest.raises(ValueError, match="NOT"):
+        index.search(query)
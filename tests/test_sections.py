@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from conftest import SAMPLE_DIR
+from resume_parser.sections import segment, segment_text
+
+
+def _page(*lines):
+    """A span dict with one (text, size, flags) span per line."""
+    return {"blocks": [{"type": 0, "lines": [{"spans": [{"text": t, "size": size, "flags": flags, "font": "Body"}]}
+                                             for t, size, flags in lines]}]}
+
+
+def test_heading_spans_without_spaces_match_spaced_text():
+    body = "Built and shipped several web services used across the company"
+    text = (f"JANE DOE\nEducation\n{body}\nExperience / Position of Responsibility\n{body}\n"
+            "Skills Summary\nPython, SQL\n")
+    page = _page(("JANEDOE", 24.8, 16), ("Education", 17.2, 16), (body, 10, 0),
+                 ("Experience/PositionofResponsibility", 17.2, 16), (body, 10, 0),
+                 ("SkillsSummary", 17.2, 16), ("Python,SQL", 10, 0))
+    sections = segment([page], text)
+    assert list(sections) == ["header", "education", "experience", "skills"]
+    start, end = sections["skills"]
+    assert text[start:end] == "\nPython, SQL\n"
+
+
+def test_slightly_larger_headings_count():
+    body = "Bachelor of Technology in Computer Science, 2020 - 2024"
+    text = f"Jane Doe\nEDUCATION\n{body}\nPUBLICATIONS\n{body}\n"
+    page = _page(("Jane Doe", 27.9, 0), ("EDUCATION", 12.0, 0), (body, 10.9, 0),
+                 ("PUBLICATIONS", 12.0, 0), (body, 10.9, 0))
+    assert list(segment([page], text)) == ["header", "education", "publications"]
+
+
+def test_sub_heading_of_same_section_continues_it():
+    text = "Jane\nSKILLS\nLanguages\nTechnical Skills\nPython\n"
+    sections = segment_text(text)
+    assert sections["skills"] == (text.index("SKILLS") + len("SKILLS"), len(text))
+
+
+# Scores of the bundled samples with the original substring checks; sections must not lose any.
+BASELINE_SCORES = {
+    "My_resume (5).pdf": 40,
+    "new_resume (10).pdf": 60,
+    "new_resume (12).pdf": 60,
+    "sakshi kaushik resume (1).pdf": 40,
+}
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE_SCORES))
+def test_sample_scores_not_below_baseline(name):
+    pytest.importorskip("fitz")
+    from resume_parser import analyze_resume, parse_resume
+
+    data = parse_resume(os.path.join(SAMPLE_DIR, name))
+    assert analyze_resume(data)["resume_score"] >= BASELINE_SCORES[name]
+
+
+@pytest.mark.parametrize("name", ["new_resume (10).pdf", "new_resume (12).pdf"])
+def test_sample_experience_and_skills_headings_found(name):
+    pytest.importorskip("fitz")
+    from resume_parser import parse_resume
+
+    sections = parse_resume(os.path.join(SAMPLE_DIR, name))["sections"]
+    assert {"experience", "skills"} <= set(sections)
@@ -0,0 +1,51 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+import server  # noqa: E402
+from conftest import SAMPLE_DIR  # noqa: E402
+
+with open(os.path.join(SAMPLE_DIR, "My_resume (5).pdf"), "rb") as f:
+    PDF = f.read()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # No spaCy warm-up in the workers: the parse itself does not need it.
+    monkeypatch.setattr(server, "_new_pool", lambda: ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")))
+    with TestClient(server.app) as c:
+        yield c
+
+
+def test_parse_survives_a_killed_worker(client):
+    assert client.post("/parse", content=PDF).status_code == 200
+    for process in list(server._pool._processes.values()):
+        process.kill()
+    time.sleep(0.5)
+    assert [client.post("/parse", content=PDF).status_code for _ in range(2)] == [200, 200]
+    assert client.get("/health").json()["inflight"] == 0
+
+
+def test_timeout_replaces_the_pool(client, monkeypatch):
+    assert client.post("/parse", content=PDF).status_code == 200
+    pool = server._pool
+    monkeypatch.setattr(server, "PARSE_TIMEOUT", 0.001)
+    assert client.post("/parse", content=PDF).status_code == 504
+    assert server._pool is not pool
+    monkeypatch.setattr(server, "PARSE_TIMEOUT", 60)
+    assert client.post("/parse", content=PDF).status_code == 200
+
+
+def test_error_statuses(client):
+    assert client.post("/parse", content=b"not a pdf").status_code == 422
+    assert client.post("/parse?fields=bogus", content=PDF).status_code == 422
+    assert client.post("/parse?courses=abc", content=PDF).status_code == 400
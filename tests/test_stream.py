@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+from conftest import SAMPLE_DIR
+
+SAMPLES = sorted(f for f in os.listdir(SAMPLE_DIR) if f.endswith(".pdf"))
+
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_streamed_skills_match_full_parse(name):
+    pytest.importorskip("fitz")
+    from resume_parser import parse_resume, stream_resume
+
+    path = os.path.join(SAMPLE_DIR, name)
+    assert stream_resume(path, fields=["skills"])["skills"] == parse_resume(path)["skills"]
@@ -0,0 +1,133 @@
+# video_titles.py
+"""Persisted YouTube title cache for the bonus videos in Courses.py.
+
+Titles ship in video_titles.json and are never fetched on the request path.
+Unknown links are looked up once in a background thread (YouTube oEmbed) and
+kept in a local, untracked cache file ($RESUME_VIDEO_TITLES_CACHE, default
+.video_titles_cache.json), so the checkout is never modified at runtime. To
+refresh the shipped titles up front (needs network access):
+
+    python video_titles.py
+"""
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TITLES_PATH = os.path.join(ROOT, "video_titles.json")
+CACHE_PATH = os.environ.get("RESUME_VIDEO_TITLES_CACHE") or os.path.join(ROOT, ".video_titles_cache.json")
+OEMBED_URL = "https://www.youtube.com/oembed?format=json&url="
+DEFAULT_TITLE = "Video"
+
+_lock = threading.Lock()
+_titles: dict[str, str] | None = None
+_queued: set[str] = set()
+_worker: threading.Thread | None = None
+
+
+def _read(path: str) -> dict[str, str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path: str, titles: dict[str, str]) -> None:
+    """Write atomically: a temp file in the same directory, then rename over the target."""
+    fd, tmp = tempfile.mkstemp(prefix=".video_titles_", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(titles, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _load() -> dict[str, str]:
+    global _titles
+    if _titles is None:
+        _titles = {**_read(TITLES_PATH), **_read(CACHE_PATH)}
+    return _titles
+
+
+def _remember(link: str, title: str) -> None:
+    """Add a looked-up title to the runtime cache (merged with what other workers saved)."""
+    with _lock:
+        _load()[link] = title
+        cached = _read(CACHE_PATH)
+        cached[link] = title
+        try:
+            _write(CACHE_PATH, cached)
+        except OSError:
+            pass
+
+
+def fetch_title(link: str) -> str | None:
+    """Blocking network lookup; only used off the request path."""
+    try:
+        with urllib.request.urlopen(OEMBED_URL + urllib.parse.quote(link, safe=""), timeout=10) as resp:
+            return json.load(resp).get("title") or None
+    except Exception:
+        return None
+
+
+def _drain() -> None:
+    global _worker
+    while True:
+        with _lock:
+            if not _queued:
+                _worker = None
+                return
+            link = _queued.pop()
+        title = fetch_title(link)
+        if title:
+            _remember(link, title)
+
+
+def refresh_async(links) -> None:
+    """Queue links for a background title fetch; returns immediately."""
+    global _worker
+    with _lock:
+        _queued.update(links)
+        if _worker is None and _queued:
+            _worker = threading.Thread(target=_drain, name="video-titles", daemon=True)
+            _worker.start()
+
+
+def get_title(link: str, default: str = DEFAULT_TITLE) -> str:
+    """Cached title for link, or `default` (and a background fetch) if unknown."""
+    with _lock:
+        title = _load().get(link)
+    if title:
+        return title
+    refresh_async([link])
+    return default
+
+
+def refresh_all(links) -> int:
+    """Fetch titles for every link and save them to the shipped TITLES_PATH; returns how many were found."""
+    titles = _read(TITLES_PATH)
+    found = 0
+    for link in dict.fromkeys(links):
+        title = fetch_title(link)
+        if title:
+            titles[link] = title
+            found += 1
+    _write(TITLES_PATH, titles)
+    with _lock:
+        _load().update(titles)
+    return found
+
+
+if __name__ == "__main__":
+    from Courses import interview_videos, resume_videos
+
+    links = resume_videos + interview_videos
+    print(f"{refresh_all(links)}/{len(set(links))} titles saved to {TITLES_PATH}")